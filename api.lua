@@ -17,12 +17,52 @@ local M = {}
 M.pendingRequests = {}
 M.requestId = 0
 
+local INSTALL_ID_FILE = "install_id"
+local installId = nil
+local keyCounter = 0
+
+-- love.math.random is seeded by LÖVE at startup; plain Lua needs seeding here
+local random = love and love.math and love.math.random
+if not random then
+    math.randomseed(os.time() + math.floor(os.clock() * 1000000) + (tonumber(tostring({}):match("0x(%x+)"), 16) or 0) % 1000000)
+    random = math.random
+end
+
+--- Returns an ID unique to this install, created on first use and kept in the save directory.
+-- @return string The install ID
+local function getInstallId()
+    if installId then
+        return installId
+    end
+    local hasFilesystem = love and love.filesystem
+    if hasFilesystem and love.filesystem.getInfo(INSTALL_ID_FILE) then
+        installId = love.filesystem.read(INSTALL_ID_FILE)
+    end
+    if not installId or installId == "" then
+        installId = string.format("%08x%08x", random(0, 0x7fffffff), random(0, 0x7fffffff))
+        if hasFilesystem then
+            love.filesystem.write(INSTALL_ID_FILE, installId)
+        end
+    end
+    return installId
+end
+
+--- Generates a key for the Idempotency-Key header.
+-- Reuse the same key when retrying a create/save so the server replays its
+-- first response instead of writing again.
+-- @return string A key unique to this install and call
+function M.newIdempotencyKey()
+    keyCounter = keyCounter + 1
+    return string.format("%s-%d-%d-%08x", getInstallId(), os.time(), keyCounter, random(0, 0x7fffffff))
+end
+
 --- Utility function for making synchronous API calls.
 -- @param method string The HTTP method ('GET', 'POST', 'PUT').
 -- @param endpoint string The unique part of the URL (e.g., "/create").
 -- @param data table Optional Lua table to be sent as JSON.
+-- @param idempotencyKey string Optional Idempotency-Key header value.
 -- @return boolean, table/string success status and decoded response or error message
-local function makeSyncRequest(method, endpoint, data)
+local function makeSyncRequest(method, endpoint, data, idempotencyKey)
     local url = BASE_URL .. endpoint
     local responseBody = {}
     
@@ -42,6 +82,10 @@ local function makeSyncRequest(method, endpoint, data)
         options.headers["Content-Length"] = string.len(jsonData)
     end
     
+    if idempotencyKey then
+        options.headers["Idempotency-Key"] = idempotencyKey
+    end
+    
     -- Make the HTTP request
     local result, statusCode, headers, statusLine = http.request(options)
     
@@ -70,7 +114,8 @@ end
 -- @param endpoint string The unique part of the URL (e.g., "/create").
 -- @param data table Optional Lua table to be sent as JSON.
 -- @param callback function The function to call on completion (takes success, result).
-local function makeAsyncRequest(method, endpoint, data, callback)
+-- @param idempotencyKey string Optional Idempotency-Key header value.
+local function makeAsyncRequest(method, endpoint, data, callback, idempotencyKey)
     M.requestId = M.requestId + 1
     local requestId = M.requestId
     
@@ -91,6 +136,7 @@ local function makeAsyncRequest(method, endpoint, data, callback)
         local url = %q
         local jsonData = %q
         local requestId = %d
+        local idempotencyKey = %q
         
         local responseBody = {}
         local options = {
@@ -108,6 +154,10 @@ local function makeAsyncRequest(method, endpoint, data, callback)
             options.headers["Content-Length"] = string.len(jsonData)
         end
         
+        if idempotencyKey ~= "" then
+            options.headers["Idempotency-Key"] = idempotencyKey
+        end
+        
         local result, statusCode, headers, statusLine = http.request(options)
         
         -- Send result back to main thread
@@ -120,7 +170,7 @@ local function makeAsyncRequest(method, endpoint, data, callback)
         }
         
         love.thread.getChannel("http_response"):push(response)
-    ]], method, BASE_URL .. endpoint, data and json.encode(data) or "", requestId)
+    ]], method, BASE_URL .. endpoint, data and json.encode(data) or "", requestId, idempotencyKey or "")
     
     -- Create and start the thread
     local thread = love.thread.newThread(threadCode)
@@ -178,15 +228,17 @@ end
 -- @param username string The player's chosen username.
 -- @param callback function Called on completion (takes success, player_data/error).
 -- @param useAsync boolean Optional, defaults to true. Set false for synchronous operation.
-function M.createPlayer(username, callback, useAsync)
+-- @param idempotencyKey string Optional; pass the same key when retrying. Defaults to a new key.
+function M.createPlayer(username, callback, useAsync, idempotencyKey)
     local data = { username = username }
+    idempotencyKey = idempotencyKey or M.newIdempotencyKey()
     
     if useAsync == false then
-        local success, result = makeSyncRequest("POST", "/create", data)
+        local success, result = makeSyncRequest("POST", "/create", data, idempotencyKey)
         if callback then callback(success, result) end
         return success, result
     else
-        makeAsyncRequest("POST", "/create", data, callback)
+        makeAsyncRequest("POST", "/create", data, callback, idempotencyKey)
     end
 end
 
@@ -211,7 +263,8 @@ end
 -- @param additionalData table Optional additional data (reputation, xp, etc.).
 -- @param callback function Optional function called on completion.
 -- @param useAsync boolean Optional, defaults to true. Set false for synchronous operation.
-function M.savePlayer(username, currency, prestige_level, additionalData, callback, useAsync)
+-- @param idempotencyKey string Optional; pass the same key when retrying. Defaults to a new key.
+function M.savePlayer(username, currency, prestige_level, additionalData, callback, useAsync, idempotencyKey)
     local data = {
         username = username,
         current_currency = currency,
@@ -225,12 +278,14 @@ function M.savePlayer(username, currency, prestige_level, additionalData, callba
         end
     end
     
+    idempotencyKey = idempotencyKey or M.newIdempotencyKey()
+    
     if useAsync == false then
-        local success, result = makeSyncRequest("POST", "/save", data)
+        local success, result = makeSyncRequest("POST", "/save", data, idempotencyKey)
         if callback then callback(success, result) end
         return success, result
     else
-        makeAsyncRequest("POST", "/save", data, callback)
+        makeAsyncRequest("POST", "/save", data, callback, idempotencyKey)
     end
 end
 
@@ -0,0 +1,279 @@
+"""
+Background admin jobs for set-based player operations.
+A job such as "multiply current_currency by 0.5 for prestige >= 3" is
+stored in the admin_jobs table and applied by a runner thread as small
+keyset-paginated UPDATE chunks, each committed with the job's progress so
+live save_player traffic gets the SQLite lock between chunks and a job
+interrupted by a restart resumes where it stopped.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, update
+
+from game_data import db, Player, AdminJob
+
+# Player columns a job may modify, and columns it may filter on
+MUTABLE_FIELDS = ('current_currency', 'prestige_level', 'reputation', 'xp', 'mission_tokens')
+FILTER_FIELDS = MUTABLE_FIELDS + ('last_login', 'created_at')
+DATETIME_FIELDS = ('last_login', 'created_at')
+
+OPERATIONS = ('set', 'add', 'multiply')
+COMPARATORS = {
+    'eq': lambda col, v: col == v,
+    'ne': lambda col, v: col != v,
+    'gt': lambda col, v: col > v,
+    'gte': lambda col, v: col >= v,
+    'lt': lambda col, v: col < v,
+    'lte': lambda col, v: col <= v,
+}
+
+DEFAULT_CHUNK_SIZE = 500
+MAX_CHUNK_SIZE = 5000
+CHUNK_PAUSE = 0.05      # seconds between chunks, leaving the write lock to game traffic
+POLL_INTERVAL = 2.0     # seconds between checks for new jobs when idle
+STALE_CLAIM = 30        # seconds without a heartbeat before another runner may take a job over
+
+ACTIVE_STATUSES = ('pending', 'running')
+
+
+class JobSpecError(ValueError):
+    """A job definition is invalid."""
+
+
+# ===== JOB DEFINITION =====
+
+def normalize_operation(operation):
+    """Validate {'field', 'op', 'value'}; returns the normalized dict."""
+    if not isinstance(operation, dict):
+        raise JobSpecError('operation must be an object with field, op and value')
+    field, op, value = operation.get('field'), operation.get('op'), operation.get('value')
+    if field not in MUTABLE_FIELDS:
+        raise JobSpecError(f'operation.field must be one of: {", ".join(MUTABLE_FIELDS)}')
+    if op not in OPERATIONS:
+        raise JobSpecError(f'operation.op must be one of: {", ".join(OPERATIONS)}')
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise JobSpecError('operation.value must be a number')
+    if op == 'multiply' and value < 0:
+        raise JobSpecError('operation.value must not be negative for multiply')
+    return {'field': field, 'op': op, 'value': value}
+
+
+def normalize_filters(filters, now=None):
+    """
+    Turn {'prestige_level': {'gte': 3}, 'active_within_days': 7} into a list of
+    [field, comparator, value] triples. Relative windows are resolved to
+    absolute timestamps here, so a resumed job matches the same players.
+    """
+    if filters is None:
+        return []
+    if not isinstance(filters, dict):
+        raise JobSpecError('filter must be an object')
+    now = now or datetime.utcnow()
+    triples = []
+    for field, condition in filters.items():
+        if field == 'active_within_days':
+            if isinstance(condition, bool) or not isinstance(condition, (int, float)) or condition < 0:
+                raise JobSpecError('active_within_days must be a non-negative number')
+            triples.append(['last_login', 'gte', (now - timedelta(days=condition)).isoformat()])
+            continue
+        if field not in FILTER_FIELDS:
+            raise JobSpecError(f'Cannot filter on {field}')
+        if not isinstance(condition, dict):
+            condition = {'eq': condition}
+        for comparator, value in condition.items():
+            if comparator not in COMPARATORS:
+                raise JobSpecError(f'Unknown comparator: {comparator}')
+            if field in DATETIME_FIELDS:
+                try:
+                    datetime.fromisoformat(value)
+                except (TypeError, ValueError):
+                    raise JobSpecError(f'{field} filter needs an ISO timestamp')
+            elif isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise JobSpecError(f'{field} filter needs a number')
+            triples.append([field, comparator, value])
+    return triples
+
+
+def filter_clauses(triples):
+    """SQLAlchemy WHERE clauses for normalized filter triples."""
+    clauses = []
+    for field, comparator, value in triples:
+        if field in DATETIME_FIELDS:
+            value = datetime.fromisoformat(value)
+        clauses.append(COMPARATORS[comparator](getattr(Player, field), value))
+    return clauses
+
+
+def update_values(operation):
+    """SET expression for a normalized operation, clamped at 0 like edit_player."""
+    column = getattr(Player, operation['field'])
+    value = operation['value']
+    if operation['op'] == 'set':
+        expr = func.round(value)
+    elif operation['op'] == 'add':
+        expr = column + func.round(value)
+    else:
+        expr = func.round(column * value)
+    return {operation['field']: func.max(0, db.cast(expr, db.Integer))}
+
+
+def create_job(data):
+    """Validate a request body and queue a new job."""
+    chunk_size = int(data.get('chunk_size', DEFAULT_CHUNK_SIZE))
+    if not 1 <= chunk_size <= MAX_CHUNK_SIZE:
+        raise JobSpecError(f'chunk_size must be between 1 and {MAX_CHUNK_SIZE}')
+    operation = normalize_operation(data.get('operation'))
+    filters = normalize_filters(data.get('filter'))
+    # Freeze the player set like active_within_days: players created later are not touched
+    max_player_id = db.session.query(func.max(Player.id)).scalar() or 0
+    filters.append(['id', 'lte', max_player_id])
+    job = AdminJob(
+        operation=json.dumps(operation),
+        filters=json.dumps(filters),
+        chunk_size=chunk_size,
+        status='pending'
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+# ===== RUNNER =====
+
+class JobRunner:
+    """
+    Daemon thread that claims queued jobs and runs them chunk by chunk.
+    Every worker process may run one; the claim/heartbeat columns ensure a
+    job is only worked on by one runner at a time.
+    """
+
+    def __init__(self, app, chunk_pause=CHUNK_PAUSE, poll_interval=POLL_INTERVAL):
+        self.app = app
+        self.chunk_pause = chunk_pause
+        self.poll_interval = poll_interval
+        self.token = f'{os.getpid()}-{uuid.uuid4().hex[:12]}'
+        self._wake = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._loop, name='admin-job-runner', daemon=True)
+                thread.start()
+                self._thread = thread
+
+    def wake(self):
+        """Check for work now instead of at the next poll."""
+        self._wake.set()
+
+    def _loop(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    job_id = self.claim_next()
+                    if job_id is not None:
+                        self.run(job_id)
+                        continue
+            except Exception as e:
+                print(f"⚠️  Admin job runner error: {e}")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def claim_next(self):
+        """Atomically claim the oldest runnable job; returns its id or None."""
+        stale = datetime.utcnow() - timedelta(seconds=STALE_CLAIM)
+        claimable = db.and_(
+            AdminJob.status.in_(ACTIVE_STATUSES),
+            db.or_(AdminJob.claimed_by.is_(None), AdminJob.claimed_by == self.token,
+                   AdminJob.heartbeat_at < stale)
+        )
+        candidates = [row[0] for row in
+                      db.session.query(AdminJob.id).filter(claimable).order_by(AdminJob.id).limit(5)]
+        for job_id in candidates:
+            now = datetime.utcnow()
+            result = db.session.execute(
+                update(AdminJob)
+                .where(AdminJob.id == job_id, claimable)
+                .values(claimed_by=self.token, heartbeat_at=now, status='running',
+                        started_at=func.coalesce(AdminJob.started_at, now))
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            if result.rowcount == 1:
+                return job_id
+        return None
+
+    def _finish(self, job_id, status, error=None):
+        # Only the runner holding the claim may finish the job
+        db.session.execute(
+            update(AdminJob)
+            .where(AdminJob.id == job_id, AdminJob.claimed_by == self.token)
+            .values(status=status, error=error, claimed_by=None, finished_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
+    def run(self, job_id):
+        """Apply a claimed job chunk by chunk until done, cancelled or failed."""
+        job = db.session.get(AdminJob, job_id)
+        try:
+            operation = json.loads(job.operation)
+            clauses = filter_clauses(json.loads(job.filters))
+            values = update_values(operation)
+
+            if job.total is None:
+                job.total = db.session.query(func.count(Player.id)).filter(*clauses).scalar()
+                db.session.commit()
+
+            while True:
+                db.session.refresh(job)
+                if job.claimed_by != self.token:
+                    return  # taken over by another runner after a stall
+                if job.cancel_requested:
+                    self._finish(job_id, 'cancelled')
+                    return
+
+                ids = [row[0] for row in
+                       db.session.query(Player.id)
+                       .filter(Player.id > job.last_player_id, *clauses)
+                       .order_by(Player.id)
+                       .limit(job.chunk_size)]
+                if not ids:
+                    self._finish(job_id, 'completed')
+                    return
+
+                result = db.session.execute(
+                    update(Player).where(Player.id.in_(ids), *clauses).values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                # Progress commits with the chunk, so a restart resumes exactly here.
+                # It only advances while this runner still holds the claim at the
+                # cursor it read; otherwise the job was taken over during a stall
+                # and the chunk is rolled back instead of being applied twice.
+                progress = db.session.execute(
+                    update(AdminJob)
+                    .where(AdminJob.id == job_id, AdminJob.claimed_by == self.token,
+                           AdminJob.last_player_id == job.last_player_id)
+                    .values(last_player_id=ids[-1],
+                            processed=AdminJob.processed + result.rowcount,
+                            heartbeat_at=datetime.utcnow())
+                    .execution_options(synchronize_session=False)
+                )
+                if progress.rowcount != 1:
+                    db.session.rollback()
+                    return
+                db.session.commit()
+                time.sleep(self.chunk_pause)
+
+        except Exception as e:
+            db.session.rollback()
+            self._finish(job_id, 'failed', str(e))
@@ -7,10 +7,21 @@ from flask import Flask, request, jsonify, send_from_directory
 from datetime import datetime, timedelta
 import os
 
-from game_data import db, Player, GlobalGameState, init_db
+from game_data import db, Player, GlobalGameState, AdminJob, init_db, create_schema
+from admin_jobs import JobRunner, JobSpecError, create_job
+from player_search import SearchError, search_players
+from economy_sim import build_config, run_simulation
+from data_bundle import DataBundle
+from content_negotiation import init_content_negotiation
+from file_index import FileIndex
+from json_patch import DocumentCache, PatchConflict, PatchError, apply_patch, changed_items, file_lock
+from read_replica import ReadReplica, DEFAULT_REFRESH_INTERVAL, DEFAULT_MAX_STALENESS
+from idempotency import IdempotencyCache, idempotent, body_username, DEFAULT_MAX_ENTRIES, DEFAULT_TTL
+import hashlib
 import json as pyjson
 from flask import send_file
 from functools import wraps
+from contextlib import contextmanager
 from pathlib import Path
 
 # Initialize Flask app
@@ -20,7 +31,8 @@ app = Flask(__name__, static_folder=static_dir, static_url_path='/static')
 # Configure SQLite database
 basedir = os.path.abspath(os.path.dirname(__file__))
 home_dir = os.path.expanduser("~")
-app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{os.path.join(home_dir, "database.db")}'
+DATABASE_PATH = os.path.join(home_dir, "database.db")
+app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{DATABASE_PATH}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 # Engine options: increase timeout and allow multithreaded access when using sqlite file
 # - timeout: wait up to 30 seconds for locks to clear
@@ -32,12 +44,74 @@ app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
     }
 }
 
-# Initialize database
-init_db(app)
+# Initialize database. DB_INIT_MODE=lazy skips schema creation at import and only
+# verifies the schema version on the first request; run `flask --app app init-db` once first.
+# Simulator pool workers (spawn) re-import the `python app.py` main module as
+# __mp_main__; they never serve requests, so they must not touch the database.
+DB_INIT_MODE = os.environ.get('DB_INIT_MODE', 'auto')
+init_db(app, lazy=DB_INIT_MODE == 'lazy' or __name__ == '__mp_main__')
+
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create the database schema and default global state."""
+    create_schema(app)
+    print("✅ Database schema is up to date")
+
+# MessagePack bodies and gzip compression for API payloads
+init_content_negotiation(app)
+
+# Background runner for bulk admin jobs; started with the first request so
+# importing the app never touches the database
+job_runner = JobRunner(app)
+
+# Optional snapshot replica for admin and analytics reads. Set READ_REPLICA_PATH
+# to enable it; dashboards then never share locks with game saves.
+READ_REPLICA_PATH = os.environ.get('READ_REPLICA_PATH')
+read_replica = ReadReplica(
+    DATABASE_PATH,
+    READ_REPLICA_PATH,
+    refresh_interval=float(os.environ.get('READ_REPLICA_INTERVAL', DEFAULT_REFRESH_INTERVAL)),
+    max_staleness=float(os.environ.get('READ_REPLICA_MAX_STALENESS', DEFAULT_MAX_STALENESS))
+) if READ_REPLICA_PATH else None
+
+
+# Replay cache for Idempotency-Key retries of player create/save. Set
+# IDEMPOTENCY_STORE_PATH to share results between worker processes.
+idempotency_cache = IdempotencyCache(
+    max_entries=int(os.environ.get('IDEMPOTENCY_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)),
+    ttl=float(os.environ.get('IDEMPOTENCY_TTL', DEFAULT_TTL)),
+    store_path=os.environ.get('IDEMPOTENCY_STORE_PATH')
+)
+
+
+@app.before_request
+def start_background_workers():
+    job_runner.ensure_started()
+    if read_replica is not None:
+        read_replica.ensure_started()
 
 
 # ===== UTILITY FUNCTIONS =====
 
+@contextmanager
+def admin_read_session():
+    """
+    Yield (session, replica_info) for read-only admin queries: a session on
+    the read replica when one is configured, otherwise the primary session.
+    """
+    if read_replica is None:
+        yield db.session, {'source': 'primary', 'age_seconds': 0}
+        return
+    with read_replica.session() as session:
+        yield session, read_replica.describe()
+
+
+def replica_headers(replica_info):
+    """Response headers exposing how stale an admin read may be."""
+    return {'X-Replica-Age': str(replica_info['age_seconds'])}
+
+
 def validate_player_data(data, required_fields=None):
     """Validate player data from request."""
     if required_fields is None:
@@ -53,6 +127,7 @@ def validate_player_data(data, required_fields=None):
 # ===== GAME CLIENT ENDPOINTS =====
 
 @app.route('/api/player/create', methods=['POST'])
+@idempotent(idempotency_cache, scope=body_username)
 def create_player():
     """Create a new player account."""
     try:
@@ -125,6 +200,7 @@ def get_player(username):
 
 
 @app.route('/api/player/save', methods=['POST'])
+@idempotent(idempotency_cache, scope=body_username)
 def save_player():
     """Update player's game state."""
     try:
@@ -176,28 +252,65 @@ def save_player():
 def list_players():
     """Get list of all players for admin panel."""
     try:
-        players = Player.query.all()
-        player_list = []
+        with admin_read_session() as (session, replica_info):
+            players = session.query(Player).all()
+            player_list = []
+            
+            for player in players:
+                player_summary = {
+                    'id': player.id,
+                    'username': player.username,
+                    'current_currency': player.current_currency,
+                    'prestige_level': player.prestige_level,
+                    'reputation': player.reputation,
+                    'last_login': player.last_login.isoformat() if player.last_login else None
+                }
+                player_list.append(player_summary)
+        
+        return jsonify({
+            'success': True,
+            'players': player_list,
+            'total_count': len(player_list),
+            'replica': replica_info
+        }), 200, replica_headers(replica_info)
         
-        for player in players:
-            player_summary = {
+    except Exception as e:
+        return jsonify({'error': f'Failed to retrieve players: {str(e)}'}), 500
+
+
+@app.route('/admin/players/search', methods=['GET'])
+def search_player_usernames():
+    """Case-insensitive prefix or substring search over usernames, paginated by cursor."""
+    try:
+        with admin_read_session() as (session, replica_info):
+            players, next_cursor, mode = search_players(
+                request.args.get('q'),
+                mode=request.args.get('mode', 'prefix'),
+                limit=request.args.get('limit', 20),
+                cursor=request.args.get('cursor'),
+                session=session
+            )
+            player_list = [{
                 'id': player.id,
                 'username': player.username,
                 'current_currency': player.current_currency,
                 'prestige_level': player.prestige_level,
                 'reputation': player.reputation,
                 'last_login': player.last_login.isoformat() if player.last_login else None
-            }
-            player_list.append(player_summary)
+            } for player in players]
         
         return jsonify({
             'success': True,
+            'mode': mode,
             'players': player_list,
-            'total_count': len(player_list)
-        }), 200
+            'next_cursor': next_cursor,
+            'replica': replica_info
+        }), 200, replica_headers(replica_info)
         
+    except (SearchError, TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid search: {str(e)}'}), 400
     except Exception as e:
-        return jsonify({'error': f'Failed to retrieve players: {str(e)}'}), 500
+        return jsonify({'error': f'Failed to search players: {str(e)}'}), 500
 
 
 @app.route('/admin/player/<int:player_id>', methods=['PUT'])
@@ -246,6 +359,89 @@ def edit_player(player_id):
         return jsonify({'error': f'Failed to update player: {str(e)}'}), 500
 
 
+@app.route('/admin/jobs', methods=['POST'])
+def create_admin_job():
+    """Queue a set-based bulk operation over players."""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No JSON data provided'}), 400
+        
+        job = create_job(data)
+        job_runner.wake()
+        
+        return jsonify({
+            'success': True,
+            'message': f'Job {job.id} queued',
+            'job': job.to_dict()
+        }), 202
+        
+    except (JobSpecError, TypeError, ValueError) as e:
+        db.session.rollback()
+        return jsonify({'error': f'Invalid job: {str(e)}'}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to create job: {str(e)}'}), 500
+
+
+@app.route('/admin/jobs', methods=['GET'])
+def list_admin_jobs():
+    """List recent bulk jobs with their progress."""
+    try:
+        jobs = AdminJob.query.order_by(AdminJob.id.desc()).limit(50).all()
+        return jsonify({
+            'success': True,
+            'jobs': [job.to_dict() for job in jobs]
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to retrieve jobs: {str(e)}'}), 500
+
+
+@app.route('/admin/jobs/<int:job_id>', methods=['GET'])
+def get_admin_job(job_id):
+    """Get progress of a single bulk job."""
+    try:
+        job = db.session.get(AdminJob, job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        return jsonify({
+            'success': True,
+            'job': job.to_dict()
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to retrieve job: {str(e)}'}), 500
+
+
+@app.route('/admin/jobs/<int:job_id>/cancel', methods=['POST'])
+def cancel_admin_job(job_id):
+    """Cancel a queued job, or ask a running one to stop after its current chunk."""
+    try:
+        job = db.session.get(AdminJob, job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        if job.status not in ('pending', 'running'):
+            return jsonify({'error': f'Job is already {job.status}'}), 409
+        
+        job.cancel_requested = True
+        if job.status == 'pending' and job.claimed_by is None:
+            job.status = 'cancelled'
+            job.finished_at = datetime.utcnow()
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': f'Cancellation requested for job {job.id}',
+            'job': job.to_dict()
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to cancel job: {str(e)}'}), 500
+
+
 @app.route('/admin/global', methods=['GET'])
 def get_global_state():
     """Get global game state for admin panel."""
@@ -305,33 +501,32 @@ def update_global_state():
 def get_admin_stats():
     """Get comprehensive statistics for admin dashboard."""
     try:
-        # Player statistics
-        total_players = Player.query.count()
-        active_players = Player.query.filter(
-            Player.last_login >= datetime.utcnow() - timedelta(days=7)
-        ).count() if total_players > 0 else 0
-        
-        # Calculate resource statistics
-        if total_players > 0:
-            avg_currency = db.session.query(db.func.avg(Player.current_currency)).scalar() or 0
-            avg_reputation = db.session.query(db.func.avg(Player.reputation)).scalar() or 0
-            avg_xp = db.session.query(db.func.avg(Player.xp)).scalar() or 0
-            avg_prestige = db.session.query(db.func.avg(Player.prestige_level)).scalar() or 0
+        with admin_read_session() as (session, replica_info):
+            # Player statistics
+            total_players = session.query(Player).count()
+            active_players = session.query(Player).filter(
+                Player.last_login >= datetime.utcnow() - timedelta(days=7)
+            ).count() if total_players > 0 else 0
             
-            # Top players
-            top_currency = Player.query.order_by(Player.current_currency.desc()).limit(5).all()
-            top_reputation = Player.query.order_by(Player.reputation.desc()).limit(5).all()
-            top_prestige = Player.query.order_by(Player.prestige_level.desc()).limit(5).all()
-        else:
-            avg_currency = avg_reputation = avg_xp = avg_prestige = 0
-            top_currency = top_reputation = top_prestige = []
-        
-        # Global state
-        global_state = GlobalGameState.query.get(1)
-        
-        return jsonify({
-            'success': True,
-            'stats': {
+            # Calculate resource statistics
+            if total_players > 0:
+                avg_currency = session.query(db.func.avg(Player.current_currency)).scalar() or 0
+                avg_reputation = session.query(db.func.avg(Player.reputation)).scalar() or 0
+                avg_xp = session.query(db.func.avg(Player.xp)).scalar() or 0
+                avg_prestige = session.query(db.func.avg(Player.prestige_level)).scalar() or 0
+                
+                # Top players
+                top_currency = session.query(Player).order_by(Player.current_currency.desc()).limit(5).all()
+                top_reputation = session.query(Player).order_by(Player.reputation.desc()).limit(5).all()
+                top_prestige = session.query(Player).order_by(Player.prestige_level.desc()).limit(5).all()
+            else:
+                avg_currency = avg_reputation = avg_xp = avg_prestige = 0
+                top_currency = top_reputation = top_prestige = []
+            
+            # Global state
+            global_state = session.get(GlobalGameState, 1)
+            
+            stats = {
                 'players': {
                     'total': total_players,
                     'active_weekly': active_players,
@@ -350,7 +545,12 @@ def get_admin_stats():
                 },
                 'global_state': global_state.to_dict() if global_state else None
             }
-        }), 200
+        
+        return jsonify({
+            'success': True,
+            'stats': stats,
+            'replica': replica_info
+        }), 200, replica_headers(replica_info)
         
     except Exception as e:
         return jsonify({'error': f'Failed to retrieve statistics: {str(e)}'}), 500
@@ -360,31 +560,16 @@ def get_admin_stats():
 def list_game_files():
     """List all game data files for file browser."""
     try:
-        files = []
-        
-        # Scan data directory
-        for root, dirs, filenames in os.walk(DATA_DIR):
-            for filename in filenames:
-                if filename.endswith(('.json', '.lua')):
-                    filepath = os.path.join(root, filename)
-                    relpath = os.path.relpath(filepath, DATA_DIR)
-                    
-                    # Get file stats
-                    stat = os.stat(filepath)
-                    
-                    files.append({
-                        'name': filename,
-                        'path': relpath,
-                        'size': stat.st_size,
-                        'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                        'type': filename.split('.')[-1],
-                        'editable': filename.endswith('.json')
-                    })
-        
-        return jsonify({
+        # Served from the watched in-memory index; index_hash changes whenever any file does
+        files, index_hash = file_index.listing()
+        response = jsonify({
             'success': True,
-            'files': sorted(files, key=lambda x: x['name'])
-        }), 200
+            'files': files,
+            'index_hash': index_hash,
+            'watcher': file_index.watcher
+        })
+        response.set_etag(index_hash)
+        return response.make_conditional(request)
         
     except Exception as e:
         return jsonify({'error': f'Failed to list files: {str(e)}'}), 500
@@ -399,14 +584,16 @@ def get_file_content(filename):
         if not os.path.exists(filepath):
             return jsonify({'error': 'File not found'}), 404
         
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        content = raw.decode('utf-8')
         
         return jsonify({
             'success': True,
             'filename': filename,
             'content': content,
             'size': len(content),
+            'sha256': hashlib.sha256(raw).hexdigest(),
             'editable': filename.endswith('.json')
         }), 200
         
@@ -436,26 +623,37 @@ def save_file_content(filename):
         
         return jsonify({
             'success': True,
-            'message': f'File {filename} saved successfully'
+            'message': f'File {filename} saved successfully',
+            'hash': hashlib.sha256(data['content'].encode('utf-8')).hexdigest()
         }), 200
         
     except Exception as e:
         return jsonify({'error': f'Failed to save file: {str(e)}'}), 500
 
 
+@app.route('/admin/files/<path:filename>', methods=['PATCH'])
+def patch_file_content(filename):
+    """Apply a JSON Patch to a specific game data file."""
+    try:
+        if not filename.endswith('.json'):
+            return jsonify({'error': 'Only JSON files can be edited'}), 400
+        
+        filepath = safe_join(DATA_DIR, filename)
+        if not os.path.exists(filepath):
+            return jsonify({'error': 'File not found'}), 404
+        
+        return apply_file_patch(filepath, dump=lambda doc: pyjson.dumps(doc, indent=2, ensure_ascii=False))
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to patch file: {str(e)}'}), 500
+
+
 @app.route('/admin/achievements', methods=['GET'])
 def get_achievements():
     """Get achievements data for management."""
     try:
-        # Load progression.json for achievement definitions
-        prog_path = safe_join(DATA_DIR, 'progression.json')
-        if os.path.exists(prog_path):
-            with open(prog_path, 'r', encoding='utf-8') as f:
-                progression_data = pyjson.load(f)
-            
-            achievements = progression_data.get('milestones', {})
-        else:
-            achievements = {}
+        # Achievement definitions come from the milestones index of the compiled bundle
+        achievements = game_bundle.index('milestones')
         
         # TODO: When player achievement tracking is implemented, 
         # we could add player progress data here
@@ -474,6 +672,13 @@ def get_achievements():
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'src', 'data')
 DATA_DIR = os.path.normpath(DATA_DIR)
 
+# Watched size/mtime/hash index behind the /admin/files browser
+file_index = FileIndex(DATA_DIR)
+
+# Compiled, ID-indexed view of every JSON file in DATA_DIR. The file index hash
+# changes whenever a source is edited on disk, which tells the bundle to reload.
+game_bundle = DataBundle(DATA_DIR, source_version=lambda: file_index.listing()[1])
+
 def safe_join(base, *paths):
     p = os.path.normpath(os.path.join(base, *paths))
     if not p.startswith(base):
@@ -485,6 +690,15 @@ def atomic_write(path, content):
     with open(tmp, 'w', encoding='utf-8') as f:
         f.write(content)
     os.replace(tmp, path)
+    if path.startswith(DATA_DIR):
+        file_index.update_paths([path])
+        if path.endswith('.json'):
+            # The write has succeeded; a bundle failure must not turn it into an error
+            try:
+                game_bundle.rebuild()
+            except Exception as e:
+                print(f"⚠️  Data bundle rebuild failed, will retry on next read: {e}")
+                game_bundle.mark_stale()
 
 def validate_contracts_json(data):
     if not isinstance(data, list):
@@ -501,14 +715,78 @@ def validate_defs_json(data):
         return False, 'defs must include Resources, Departments, and GameModes'
     return True, None
 
+def validate_contracts_patch(original, patched):
+    # Only contracts the patch added or rewrote need checking
+    changed = changed_items(original, patched)
+    return validate_contracts_json(patched if changed is None else changed)
+
+def validate_defs_patch(original, patched):
+    return validate_defs_json(patched)
+
+
+# Parsed JSON documents that PATCH requests are applied to
+document_cache = DocumentCache()
+
+def read_patch_request():
+    """Return (operations, base_hash) from a PATCH body and/or If-Match header."""
+    data = request.get_json()
+    if isinstance(data, dict):
+        patch, base_hash = data.get('patch'), data.get('base_hash')
+    else:
+        patch, base_hash = data, None
+    if not base_hash:
+        # include_weak: gzip responses carry W/"<hash>" (see content_negotiation)
+        base_hash = next(iter(request.if_match.as_set(include_weak=True)), None)
+    return patch, base_hash
+
+def apply_file_patch(filepath, validate=None, dump=lambda doc: pyjson.dumps(doc, indent=2)):
+    """
+    Apply an RFC 6902 patch to the cached document for `filepath` and write it
+    back. The patch must name the SHA-256 of the file it was built against;
+    stale hashes are rejected with 409. The check and the write run under a
+    file lock shared by all worker processes.
+    """
+    patch, base_hash = read_patch_request()
+    if patch is None:
+        return jsonify({'error': 'No patch provided'}), 400
+    if not base_hash:
+        return jsonify({'error': 'base_hash (or If-Match header) is required'}), 400
+    
+    with document_cache.lock, file_lock(filepath):
+        document, current_hash = document_cache.load(filepath)
+        if base_hash != current_hash:
+            return jsonify({
+                'error': 'File has changed since base_hash; reload and retry',
+                'current_hash': current_hash
+            }), 409
+        try:
+            patched = apply_patch(document, patch)
+        except PatchConflict as e:
+            return jsonify({'error': str(e), 'current_hash': current_hash}), 409
+        except PatchError as e:
+            return jsonify({'error': f'Invalid patch: {str(e)}'}), 400
+        if validate:
+            ok, err = validate(document, patched)
+            if not ok:
+                return jsonify({'error': err}), 400
+        
+        content = dump(patched)
+        atomic_write(filepath, content)
+        new_hash = document_cache.store(filepath, patched, content.encode('utf-8'))
+    
+    return jsonify({'success': True, 'hash': new_hash, 'operations': len(patch)}), 200
+
 
 @app.route('/admin/data/contracts', methods=['GET'])
 def get_contracts_data():
     try:
         path = safe_join(DATA_DIR, 'contracts.json')
-        with open(path, 'r', encoding='utf-8') as f:
+        with open(path, 'rb') as f:
             content = f.read()
-        return app.response_class(content, mimetype='application/json')
+        response = app.response_class(content, mimetype='application/json')
+        # The ETag is the base hash for PATCH requests
+        response.set_etag(hashlib.sha256(content).hexdigest())
+        return response
     except Exception as e:
         return jsonify({'error': f'Failed to read contracts.json: {str(e)}'}), 500
 
@@ -523,19 +801,32 @@ def put_contracts_data():
         if not ok:
             return jsonify({'error': err}), 400
         path = safe_join(DATA_DIR, 'contracts.json')
-        atomic_write(path, pyjson.dumps(data, indent=2))
-        return jsonify({'success': True}), 200
+        content = pyjson.dumps(data, indent=2)
+        atomic_write(path, content)
+        return jsonify({'success': True, 'hash': hashlib.sha256(content.encode('utf-8')).hexdigest()}), 200
     except Exception as e:
         return jsonify({'error': f'Failed to write contracts.json: {str(e)}'}), 500
 
 
+@app.route('/admin/data/contracts', methods=['PATCH'])
+def patch_contracts_data():
+    try:
+        path = safe_join(DATA_DIR, 'contracts.json')
+        return apply_file_patch(path, validate=validate_contracts_patch)
+    except Exception as e:
+        return jsonify({'error': f'Failed to patch contracts.json: {str(e)}'}), 500
+
+
 @app.route('/admin/data/defs', methods=['GET'])
 def get_defs_data():
     try:
         path = safe_join(DATA_DIR, 'defs.json')
-        with open(path, 'r', encoding='utf-8') as f:
+        with open(path, 'rb') as f:
             content = f.read()
-        return app.response_class(content, mimetype='application/json')
+        response = app.response_class(content, mimetype='application/json')
+        # The ETag is the base hash for PATCH requests
+        response.set_etag(hashlib.sha256(content).hexdigest())
+        return response
     except Exception as e:
         return jsonify({'error': f'Failed to read defs.json: {str(e)}'}), 500
 
@@ -550,12 +841,107 @@ def put_defs_data():
         if not ok:
             return jsonify({'error': err}), 400
         path = safe_join(DATA_DIR, 'defs.json')
-        atomic_write(path, pyjson.dumps(data, indent=2))
-        return jsonify({'success': True}), 200
+        content = pyjson.dumps(data, indent=2)
+        atomic_write(path, content)
+        return jsonify({'success': True, 'hash': hashlib.sha256(content.encode('utf-8')).hexdigest()}), 200
     except Exception as e:
         return jsonify({'error': f'Failed to write defs.json: {str(e)}'}), 500
 
 
+@app.route('/admin/data/defs', methods=['PATCH'])
+def patch_defs_data():
+    try:
+        path = safe_join(DATA_DIR, 'defs.json')
+        return apply_file_patch(path, validate=validate_defs_patch)
+    except Exception as e:
+        return jsonify({'error': f'Failed to patch defs.json: {str(e)}'}), 500
+
+
+@app.route('/api/data/bundle', methods=['GET'])
+def get_data_bundle():
+    """Serve the compiled game-data bundle as a single cacheable blob."""
+    try:
+        bundle = game_bundle.get()
+        response = app.response_class(game_bundle.blob(), mimetype='application/json')
+        response.set_etag(bundle['hash'])
+        response.cache_control.public = True
+        response.cache_control.no_cache = True  # always revalidate against the ETag
+        return response.make_conditional(request)
+    except Exception as e:
+        return jsonify({'error': f'Failed to load data bundle: {str(e)}'}), 500
+
+
+@app.route('/admin/data/bundle', methods=['POST'])
+def rebuild_data_bundle():
+    """Recompile the game-data bundle from the files in DATA_DIR."""
+    try:
+        bundle = game_bundle.rebuild()
+        return jsonify({
+            'success': True,
+            'hash': bundle['hash'],
+            'format_version': bundle['format_version'],
+            'built_at': bundle['built_at'],
+            'size': len(game_bundle.blob()),
+            'sources': bundle['sources'],
+            'errors': bundle['errors']
+        }), 200
+    except Exception as e:
+        return jsonify({'error': f'Failed to build data bundle: {str(e)}'}), 500
+
+
+# Upper bounds for ad-hoc simulation runs from the admin panel
+SIM_MAX_PLAYERS = 50000
+SIM_MAX_DAYS = 365
+
+# Top-level JSON type of each document the simulator reads
+SIM_DOCUMENT_TYPES = {'progression': dict, 'currencies': dict, 'contracts': list}
+
+
+@app.route('/admin/simulate', methods=['POST'])
+def simulate_economy():
+    """
+    Run the Monte Carlo economy simulator against the current tuning files.
+    Optional `data` entries (progression, currencies, contracts) replace the
+    on-disk documents so a tuning change can be checked before it is saved.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        players = min(SIM_MAX_PLAYERS, max(1, int(data.get('players', 1000))))
+        days = min(SIM_MAX_DAYS, max(1, int(data.get('days', 30))))
+
+        documents = {name: game_bundle.document(name) for name in SIM_DOCUMENT_TYPES}
+        for name, document in (data.get('data') or {}).items():
+            if name not in documents:
+                return jsonify({'error': f'Unknown data document: {name}'}), 400
+            documents[name] = document
+        for name, expected in SIM_DOCUMENT_TYPES.items():
+            if not isinstance(documents[name], expected):
+                kind = 'a JSON object' if expected is dict else 'a JSON array'
+                return jsonify({'error': f'{name} must be {kind}'}), 400
+        ok, err = validate_contracts_json(documents['contracts'])
+        if not ok:
+            return jsonify({'error': err}), 400
+
+        global_state = GlobalGameState.query.get(1)
+        multipliers = global_state.to_dict() if global_state else {}
+        multipliers.update(data.get('multipliers') or {})
+
+        try:
+            config = build_config(documents, multipliers, data.get('behaviour'))
+        except (AttributeError, KeyError) as e:
+            # Nested sections of the right name but the wrong shape
+            return jsonify({'error': f'Invalid tuning data: {str(e)}'}), 400
+        result = run_simulation(config, players, days,
+                                seed=int(data.get('seed', 0)),
+                                workers=data.get('workers'))
+        return jsonify({'success': True, 'simulation': result}), 200
+
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid simulation parameters: {str(e)}'}), 400
+    except Exception as e:
+        return jsonify({'error': f'Failed to run simulation: {str(e)}'}), 500
+
+
 # ===== HEALTH CHECK ENDPOINT =====
 
 @app.route('/health', methods=['GET'])
@@ -565,7 +951,8 @@ def health_check():
         'status': 'healthy',
         'service': 'Cyberspace Tycoon API',
         'version': '1.0.0',
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': datetime.utcnow().isoformat(),
+        'idempotency_cache': idempotency_cache.stats()
     }), 200
 
 
@@ -609,9 +996,16 @@ if __name__ == '__main__':
     print("     POST /api/player/save")
     print("   Admin Panel:")
     print("     GET  /admin/players")
+    print("     GET  /admin/players/search?q=")
     print("     PUT  /admin/player/<id>")
     print("     GET  /admin/global")
     print("     PUT  /admin/global")
+    print("     POST /admin/jobs")
+    print("     GET  /admin/jobs[/<id>]")
+    print("     POST /admin/jobs/<id>/cancel")
+    print("     POST /admin/simulate")
+    print("     POST /admin/data/bundle")
+    print("   Game Data: GET /api/data/bundle")
     print("   Health: GET /health")
     
     app.run(debug=True, host='0.0.0.0', port=5001)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark wire size and encode/decode time of typical API payloads
+for each encoding the API can negotiate.
+
+Usage (from the backend directory):
+    python bench_payloads.py
+    python bench_payloads.py --players 5000 --repeat 200
+"""
+
+import argparse
+import gzip
+import json
+import timeit
+from datetime import datetime, timedelta
+
+from content_negotiation import GZIP_LEVEL, GZIP_MIN_SIZE, msgpack
+
+
+def make_player(index):
+    """Player dict shaped like Player.to_dict()."""
+    now = datetime(2025, 1, 1)
+    return {
+        'id': index,
+        'username': f'player{index:06d}',
+        'current_currency': 1000 + index * 37,
+        'prestige_level': index % 5,
+        'reputation': index * 3 % 900,
+        'xp': index * 11,
+        'mission_tokens': index % 7,
+        'last_login': (now + timedelta(minutes=index)).isoformat(),
+        'created_at': now.isoformat()
+    }
+
+
+def make_payloads(players):
+    """Representative request/response bodies for the busiest endpoints."""
+    player = make_player(1)
+    save_request = {k: player[k] for k in
+                    ('username', 'current_currency', 'prestige_level', 'reputation', 'xp', 'mission_tokens')}
+    return {
+        'save request': save_request,
+        'save response': {
+            'success': True,
+            'message': f"Player {player['username']} data saved successfully",
+            'player': player
+        },
+        f'player list ({players})': {
+            'success': True,
+            'players': [{k: p[k] for k in ('id', 'username', 'current_currency', 'prestige_level',
+                                          'reputation', 'last_login')}
+                        for p in map(make_player, range(players))],
+            'total_count': players
+        }
+    }
+
+
+def make_codecs():
+    """(name, encode, decode) for every negotiable encoding; gzip only applies above GZIP_MIN_SIZE."""
+    def gzipped(encode, decode):
+        def enc(obj):
+            data = encode(obj)
+            return gzip.compress(data, compresslevel=GZIP_LEVEL) if len(data) >= GZIP_MIN_SIZE else data
+
+        def dec(data):
+            return decode(gzip.decompress(data) if data[:2] == b'\x1f\x8b' else data)
+        return enc, dec
+
+    json_pretty = (lambda o: json.dumps(o, indent=2).encode('utf-8'), json.loads)
+    json_compact = (lambda o: json.dumps(o, separators=(',', ':')).encode('utf-8'), json.loads)
+    codecs = [
+        ('json (pretty)', *json_pretty),
+        ('json', *json_compact),
+        ('json + gzip', *gzipped(*json_compact)),
+    ]
+    if msgpack is not None:
+        packed = (lambda o: msgpack.packb(o, use_bin_type=True), lambda d: msgpack.unpackb(d, raw=False))
+        codecs += [
+            ('msgpack', *packed),
+            ('msgpack + gzip', *gzipped(*packed)),
+        ]
+    return codecs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark API payload encodings.')
+    parser.add_argument('--players', type=int, default=1000, help='rows in the player list payload')
+    parser.add_argument('--repeat', type=int, default=100)
+    args = parser.parse_args()
+
+    if msgpack is None:
+        print("⚠️  msgpack is not installed; only JSON encodings are measured")
+
+    codecs = make_codecs()
+    for name, payload in make_payloads(args.players).items():
+        print(f"\n📦 {name}")
+        print(f"   {'encoding':<16} {'bytes':>10} {'encode µs':>11} {'decode µs':>11}")
+        for codec, encode, decode in codecs:
+            data = encode(payload)
+            assert decode(data) == payload
+            enc_us = timeit.timeit(lambda: encode(payload), number=args.repeat) / args.repeat * 1e6
+            dec_us = timeit.timeit(lambda: decode(data), number=args.repeat) / args.repeat * 1e6
+            print(f"   {codec:<16} {len(data):>10} {enc_us:>11.1f} {dec_us:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
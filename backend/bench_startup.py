@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark worker cold start: boot N processes that import the app at the
+same time and time how long they take, for each DB_INIT_MODE.
+
+Each run uses a throwaway HOME so the benchmark gets its own database.db.
+
+Usage (from the backend directory):
+    python bench_startup.py --workers 16
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Child process: pre-import the libraries (interpreter and Flask/SQLAlchemy import
+# cost is the same in every mode), then time importing the app itself
+BOOT_SNIPPET = (
+    "import flask, flask_sqlalchemy, sqlalchemy, time; "
+    "t = time.perf_counter(); import app; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def boot_workers(workers, env):
+    """Start `workers` processes at once; return (wall seconds, per-worker app init seconds, failures)."""
+    started = time.perf_counter()
+    procs = [
+        subprocess.Popen([sys.executable, '-c', BOOT_SNIPPET], cwd=BACKEND_DIR, env=env,
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        for _ in range(workers)
+    ]
+    timings, failures = [], 0
+    for proc in procs:
+        out, _ = proc.communicate()
+        if proc.returncode == 0:
+            timings.append(float(out.strip().splitlines()[-1]))
+        else:
+            failures += 1
+    return time.perf_counter() - started, timings, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark concurrent worker startup.')
+    parser.add_argument('--workers', type=int, default=16)
+    args = parser.parse_args()
+
+    for mode in ('auto', 'lazy'):
+        with tempfile.TemporaryDirectory() as home:
+            env = dict(os.environ, HOME=home, DB_INIT_MODE=mode, PYTHONDONTWRITEBYTECODE='1')
+            if mode == 'lazy':
+                # Schema creation is the separate one-shot step in lazy mode
+                subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'init-db'],
+                               cwd=BACKEND_DIR, env=dict(env, DB_INIT_MODE='auto'),
+                               check=True, capture_output=True)
+            wall, timings, failures = boot_workers(args.workers, env)
+
+        timings.sort()
+        print(f"\n🚀 DB_INIT_MODE={mode}, {args.workers} workers")
+        print(f"   wall time:       {wall * 1000:8.1f} ms")
+        if timings:
+            print(f"   app init median: {timings[len(timings) // 2] * 1000:8.1f} ms")
+            print(f"   app init slowest:{timings[-1] * 1000:8.1f} ms")
+        print(f"   failed workers:  {failures}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Content negotiation for Cyberspace Tycoon API payloads.
+JSON stays the default; clients can opt into MessagePack bodies through
+Content-Type/Accept, and large responses are gzip-compressed when the
+client sends Accept-Encoding: gzip.
+"""
+
+import gzip
+
+from flask import Request, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import BadRequest, UnsupportedMediaType
+
+try:
+    import msgpack
+except ImportError:  # optional dependency: JSON-only without it
+    msgpack = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+MSGPACK_MIMETYPES = (MSGPACK_MIMETYPE, 'application/x-msgpack', 'application/vnd.msgpack')
+
+# Responses smaller than this are sent uncompressed; gzip overhead outweighs the savings
+GZIP_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+COMPRESSIBLE_MIMETYPES = (JSON_MIMETYPE, MSGPACK_MIMETYPE, 'text/html', 'text/css',
+                          'text/plain', 'application/javascript', 'text/javascript')
+
+
+def wants_msgpack():
+    """True if the current request prefers a MessagePack response over JSON."""
+    if msgpack is None or not has_request_context():
+        return False
+    best = request.accept_mimetypes.best_match((JSON_MIMETYPE,) + MSGPACK_MIMETYPES)
+    return best in MSGPACK_MIMETYPES
+
+
+class NegotiatingRequest(Request):
+    """Request whose get_json() also decodes MessagePack bodies."""
+
+    def get_json(self, force=False, silent=False, cache=True):
+        if self.mimetype not in MSGPACK_MIMETYPES:
+            return super().get_json(force=force, silent=silent, cache=cache)
+        if msgpack is None:
+            if silent:
+                return None
+            raise UnsupportedMediaType('MessagePack support is not installed on this server')
+        try:
+            return msgpack.unpackb(self.get_data(cache=cache), raw=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as e:
+            if silent:
+                return None
+            raise BadRequest(f'Failed to decode MessagePack body: {e}')
+
+
+class NegotiatingJSONProvider(DefaultJSONProvider):
+    """jsonify() provider that emits compact JSON, or MessagePack when the client asks for it."""
+
+    compact = True
+
+    def response(self, *args, **kwargs):
+        if not wants_msgpack():
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = msgpack.packb(obj, default=self.default, use_bin_type=True)
+        return self._app.response_class(body, mimetype=MSGPACK_MIMETYPE)
+
+
+def compress_response(response):
+    """after_request hook: gzip compressible responses above GZIP_MIN_SIZE."""
+    if response.mimetype in (JSON_MIMETYPE, MSGPACK_MIMETYPE):
+        response.vary.add('Accept')
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    if not request.accept_encodings['gzip']:
+        return response
+    data = response.get_data()
+    if len(data) < GZIP_MIN_SIZE:
+        return response
+
+    response.set_data(gzip.compress(data, compresslevel=GZIP_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    # The compressed body differs byte-for-byte, so a strong validator no longer applies
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_content_negotiation(app):
+    """Install MessagePack request/response support and gzip compression on the app."""
+    app.request_class = NegotiatingRequest
+    app.json = NegotiatingJSONProvider(app)
+    app.after_request(compress_response)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Compiled game-data bundle for Cyberspace Tycoon.
+Folds every JSON tuning file in src/data into one compact, content-hashed
+artifact with ID indexes, so clients and server workers load a single
+pre-parsed document instead of re-reading many nested JSON files.
+
+Usage (from the backend directory):
+    python data_bundle.py            # build backend/build/game_data.bundle.json
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+BUNDLE_FORMAT_VERSION = 2
+
+DEFAULT_DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', 'src', 'data'))
+DEFAULT_BUNDLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'build', 'game_data.bundle.json')
+
+
+def _index_by_id(entries):
+    """Index a list or dict of objects carrying an `id` field."""
+    if isinstance(entries, dict):
+        values = entries.values()
+    elif isinstance(entries, list):
+        values = entries
+    else:
+        return {}
+    return {entry['id']: entry for entry in values if isinstance(entry, dict) and 'id' in entry}
+
+
+def _section(document, key):
+    """document[key] if the document is an object, else None; tolerates hand-edited files."""
+    return document.get(key) if isinstance(document, dict) else None
+
+
+def build_indexes(data):
+    """Build the by-ID lookup tables shipped alongside the raw documents."""
+    progression = data.get('progression')
+    return {
+        'contracts': _index_by_id(data.get('contracts')),
+        'currencies': _index_by_id(_section(data.get('currencies'), 'currencies')),
+        'milestones': _index_by_id(_section(progression, 'milestones')),
+        'tiers': _index_by_id(_section(progression, 'progressionTiers')),
+        'buildings': _index_by_id(_section(data.get('locations'), 'buildings')),
+    }
+
+
+def source_fingerprints(data_dir):
+    """SHA-256 of every JSON source file, keyed by document name."""
+    fingerprints = {}
+    for filename in sorted(os.listdir(data_dir)):
+        if filename.endswith('.json'):
+            with open(os.path.join(data_dir, filename), 'rb') as f:
+                fingerprints[filename[:-5]] = hashlib.sha256(f.read()).hexdigest()
+    return fingerprints
+
+
+def compile_bundle(data_dir=DEFAULT_DATA_DIR):
+    """
+    Compile all JSON tuning files into a bundle dict. The bundle hash covers
+    the compiled data only, so rebuilding unchanged sources keeps the hash.
+    Files that do not parse are left out of `data` and listed under `errors`
+    instead of failing the whole build.
+    """
+    data = {}
+    sources = {}
+    errors = {}
+    for filename in sorted(os.listdir(data_dir)):
+        if not filename.endswith('.json'):
+            continue
+        with open(os.path.join(data_dir, filename), 'rb') as f:
+            raw = f.read()
+        name = filename[:-5]
+        sources[name] = hashlib.sha256(raw).hexdigest()
+        try:
+            data[name] = json.loads(raw)
+        except ValueError as e:
+            errors[name] = str(e)
+
+    payload = {'data': data, 'index': build_indexes(data)}
+    digest = hashlib.sha256(
+        json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    ).hexdigest()
+    return {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'hash': digest,
+        'built_at': datetime.utcnow().isoformat(),
+        'sources': sources,
+        'errors': errors,
+        **payload,
+    }
+
+
+def encode_bundle(bundle):
+    """Serialize a bundle in compact form."""
+    return json.dumps(bundle, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def write_bundle(bundle, path=DEFAULT_BUNDLE_PATH):
+    """Atomically write the compact bundle artifact and return its bytes."""
+    blob = encode_bundle(bundle)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Unique temp name: several workers may rebuild at once
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.game_data.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(blob)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return blob
+
+
+class DataBundle:
+    """
+    Process-wide holder for the compiled bundle. Workers load the artifact
+    once and re-read it when its mtime changes (another worker rebuilt it)
+    or when `source_version()` changes (a source file was edited, e.g. the
+    FileIndex hash); the sources are recompiled when the artifact is missing
+    or stale.
+    """
+
+    def __init__(self, data_dir=DEFAULT_DATA_DIR, path=DEFAULT_BUNDLE_PATH, source_version=None):
+        self.data_dir = data_dir
+        self.path = path
+        self.source_version = source_version
+        self._lock = threading.Lock()
+        self._bundle = None
+        self._blob = None
+        self._mtime_ns = None
+        self._version = None
+        self._stale = False
+
+    def _current_version(self):
+        return self.source_version() if self.source_version is not None else None
+
+    def _artifact_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load_artifact(self):
+        """Load the on-disk artifact if it matches the current sources."""
+        try:
+            with open(self.path, 'rb') as f:
+                blob = f.read()
+            bundle = json.loads(blob)
+        except (OSError, ValueError):
+            return False
+        if bundle.get('format_version') != BUNDLE_FORMAT_VERSION:
+            return False
+        if bundle.get('sources') != source_fingerprints(self.data_dir):
+            return False
+        self._bundle, self._blob = bundle, blob
+        self._mtime_ns = self._artifact_mtime()
+        return True
+
+    def rebuild(self):
+        """Recompile the sources and replace the artifact."""
+        with self._lock:
+            version = self._current_version()
+            bundle = compile_bundle(self.data_dir)
+            self._blob = write_bundle(bundle, self.path)
+            self._bundle = bundle
+            self._mtime_ns = self._artifact_mtime()
+            self._version = version
+            self._stale = False
+            return bundle
+
+    def mark_stale(self):
+        """Force the next read to re-check the sources (e.g. after a failed rebuild)."""
+        self._stale = True
+
+    def _is_current(self, version):
+        return (self._bundle is not None and not self._stale
+                and self._artifact_mtime() == self._mtime_ns and version == self._version)
+
+    def _ensure_current(self):
+        version = self._current_version()
+        if self._is_current(version):
+            return
+        with self._lock:
+            if self._is_current(version):
+                return
+            if self._load_artifact():
+                self._version = version
+                self._stale = False
+                return
+        self.rebuild()
+
+    def get(self):
+        """Return the current bundle dict (shared; do not mutate)."""
+        self._ensure_current()
+        return self._bundle
+
+    def blob(self):
+        """Return the compact serialized bundle."""
+        self._ensure_current()
+        return self._blob
+
+    def document(self, name):
+        """Return one parsed source document, e.g. 'progression'."""
+        return self.get()['data'].get(name)
+
+    def index(self, name):
+        """Return one by-ID index, e.g. 'contracts'."""
+        return self.get()['index'].get(name, {})
+
+
+def main():
+    bundle = DataBundle()
+    built = bundle.rebuild()
+    print(f"📦 Built {bundle.path}")
+    print(f"   hash: {built['hash']}")
+    print(f"   size: {len(bundle.blob())} bytes from {len(built['sources'])} source files")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo economy simulator for Cyberspace Tycoon balance tuning.
+Loads the tuning files from src/data plus the global multipliers and
+estimates how long synthetic players take to reach each milestone.
+
+Usage (from the backend directory):
+    python economy_sim.py --players 10000 --days 30
+    python economy_sim.py --database ~/database.db --global-multiplier 1.5
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sqlite3
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', 'src', 'data'))
+
+# Slots in the per-player resource vector
+MONEY, REPUTATION, XP, CONTRACTS, EARNED = range(5)
+SLOT_COUNT = 5
+
+# Requirement/reward keys the simulator understands, mapped to resource slots.
+# Anything else (specialists, missionTokens, ...) is reported as unmodelled.
+RESOURCE_KEYS = {
+    'money': MONEY,
+    'reputation': REPUTATION,
+    'xp': XP,
+    'experience': XP,
+    'contracts': CONTRACTS,
+    'completed_contracts': CONTRACTS,
+    'totalEarnings': EARNED,
+}
+
+# contracts.json carries no unlock data, so the risk level gates each
+# contract template behind a progression tier level.
+RISK_TIER_LEVEL = {'LOW': 1, 'MEDIUM': 2, 'HIGH': 3}
+
+# XP awarded per minute of contract work, before tier xpGeneration bonuses
+XP_PER_CONTRACT_MINUTE = 1.0
+
+# currencies.json does not state a unit for passive_income.base_rate;
+# the simulator treats it as money per minute.
+PASSIVE_UNIT_SECONDS = 60
+
+# Synthetic player behaviour; any key can be overridden per run
+DEFAULT_BEHAVIOUR = {
+    'median_session_hours': 1.5,   # median hours played on an active day
+    'session_spread': 0.6,         # lognormal sigma of per-player session length
+    'daily_jitter': 0.5,           # +/- fraction applied to each day's session
+    'skip_day_chance': 0.15,       # chance a player does not log in on a day
+    'skill_spread': 0.25,          # lognormal sigma of per-player efficiency
+}
+
+DEFAULT_MULTIPLIERS = {'base_production_rate': 1.0, 'global_multiplier': 1.0}
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+# ===== DATA LOADING =====
+
+def load_tuning_data(data_dir=DEFAULT_DATA_DIR):
+    """Load the tuning documents the simulator reads from DATA_DIR."""
+    documents = {}
+    for name in ('progression', 'currencies', 'contracts'):
+        with open(os.path.join(data_dir, f'{name}.json'), 'r', encoding='utf-8') as f:
+            documents[name] = json.load(f)
+    return documents
+
+
+def load_db_multipliers(database_path):
+    """Read GlobalGameState multipliers straight from a SQLite database file."""
+    conn = sqlite3.connect(database_path, timeout=30)
+    try:
+        row = conn.execute(
+            'SELECT base_production_rate, global_multiplier FROM global_game_state WHERE id = 1'
+        ).fetchone()
+    finally:
+        conn.close()
+    if not row:
+        return dict(DEFAULT_MULTIPLIERS)
+    return {'base_production_rate': row[0], 'global_multiplier': row[1]}
+
+
+def _split_requirements(requirements):
+    """Split a requirements dict into modelled (slot, threshold) pairs and unmodelled keys."""
+    reqs, unmodelled = [], []
+    for key, value in (requirements or {}).items():
+        if key in RESOURCE_KEYS:
+            if value and value > 0:
+                reqs.append((RESOURCE_KEYS[key], float(value)))
+        elif key != 'progressionTier':
+            unmodelled.append(key)
+    return tuple(reqs), unmodelled
+
+
+def build_config(documents, multipliers=None, behaviour=None):
+    """
+    Compile tuning documents into the flat, picklable structure the
+    cohort workers consume. Rates are per second of game time.
+    """
+    mult = dict(DEFAULT_MULTIPLIERS)
+    mult.update({k: float(v) for k, v in (multipliers or {}).items() if k in DEFAULT_MULTIPLIERS})
+    behave = dict(DEFAULT_BEHAVIOUR)
+    behave.update({k: float(v) for k, v in (behaviour or {}).items() if k in DEFAULT_BEHAVIOUR})
+
+    progression = documents['progression']
+    currencies = documents['currencies']
+    contracts = documents['contracts']
+    global_mult = mult['global_multiplier']
+
+    passive = currencies.get('generation', {}).get('passive_income', {})
+    passive_base = float(passive.get('base_rate', 0)) / PASSIVE_UNIT_SECONDS
+
+    tiers = sorted(progression.get('progressionTiers', {}).values(), key=lambda t: t.get('level', 0))
+    if not tiers:
+        raise ValueError('progression.json has no progressionTiers')
+
+    tier_rates = []
+    targets = []
+    unmodelled = {}
+    blocked = False  # set once a tier is gated on a resource the simulator cannot model
+    for index, tier in enumerate(tiers):
+        bonuses = tier.get('bonuses', {})
+        level = tier.get('level', index + 1)
+        capacity = bonuses.get('contractCapacity', 1)
+        money_mult = bonuses.get('moneyGeneration', 1.0)
+        xp_mult = bonuses.get('xpGeneration', 1.0)
+
+        # Every contract slot runs the best-paying template unlocked at this tier
+        best = None
+        for contract in contracts:
+            if RISK_TIER_LEVEL.get(contract.get('riskLevel'), 1) > level:
+                continue
+            duration = max(1.0, float(contract.get('baseDuration', 60)))
+            pay = float(contract.get('baseBudget', 0)) / duration
+            if best is None or pay > best[0]:
+                best = (pay, float(contract.get('reputationReward', 0)) / duration, 1.0 / duration)
+        pay, rep, done = best or (0.0, 0.0, 0.0)
+
+        active = [0.0] * SLOT_COUNT
+        active[MONEY] = capacity * pay * money_mult * global_mult
+        active[REPUTATION] = capacity * rep
+        active[XP] = capacity * XP_PER_CONTRACT_MINUTE / 60.0 * xp_mult * global_mult
+        active[CONTRACTS] = capacity * done
+        idle = [0.0] * SLOT_COUNT
+        idle[MONEY] = passive_base * mult['base_production_rate'] * money_mult * global_mult
+        idle[EARNED] = idle[MONEY]
+        active[EARNED] = active[MONEY]
+        tier_rates.append((tuple(active), tuple(idle)))
+
+        if index > 0:
+            reqs, missing = _split_requirements(tier.get('requirements'))
+            key = f"tier:{tier['id']}"
+            if missing or blocked:
+                # Like milestones, a tier gated on an unmodelled resource is never
+                # reached, and neither is anything above it: progression stops here
+                unmodelled[key] = missing or ['progressionTier']
+                blocked = True
+            else:
+                targets.append({'key': key, 'reqs': reqs, 'rewards': (), 'min_tier': index - 1, 'tier': index})
+
+    for milestone_id, milestone in progression.get('milestones', {}).items():
+        key = f'milestone:{milestone_id}'
+        reqs, missing = _split_requirements(milestone.get('requirements'))
+        if missing:
+            # A milestone gated on an unmodelled resource can never be reached here
+            unmodelled[key] = missing
+            continue
+        rewards = tuple((RESOURCE_KEYS[k], float(v)) for k, v in milestone.get('rewards', {}).items()
+                        if k in RESOURCE_KEYS)
+        targets.append({'key': key, 'reqs': reqs, 'rewards': rewards, 'min_tier': 0, 'tier': None})
+
+    prestige = progression.get('prestigeSystem', {})
+    if prestige.get('enabled'):
+        unlock = prestige.get('unlockRequirements', {})
+        tier_ids = [t['id'] for t in tiers]
+        min_tier = tier_ids.index(unlock['progressionTier']) if unlock.get('progressionTier') in tier_ids else 0
+        reqs, missing = _split_requirements(unlock)
+        targets.append({'key': 'prestige_unlock', 'reqs': reqs, 'rewards': (), 'min_tier': min_tier, 'tier': None})
+        if missing:
+            unmodelled['prestige_unlock'] = missing
+
+    start = [0.0] * SLOT_COUNT
+    for currency_id, currency in currencies.get('currencies', {}).items():
+        if currency_id in RESOURCE_KEYS:
+            start[RESOURCE_KEYS[currency_id]] = float(currency.get('startingAmount', 0))
+
+    return {
+        'tier_ids': [t['id'] for t in tiers],
+        'tier_rates': tier_rates,
+        'targets': targets,
+        'start': tuple(start),
+        'behaviour': behave,
+        'multipliers': mult,
+        'unmodelled': unmodelled,
+    }
+
+
+# ===== SIMULATION =====
+
+def simulate_cohort(config, players, days, seed):
+    """
+    Simulate one cohort of players. State lives in flat arrays indexed by
+    player; each player's day is split into an active and an idle segment
+    with constant rates, and targets are resolved analytically inside a
+    segment, so cost scales with days and events rather than ticks.
+    """
+    rng = random.Random(seed)
+    behave = config['behaviour']
+    tier_rates = config['tier_rates']
+    targets = config['targets']
+    n_targets = len(targets)
+    reqs = [t['reqs'] for t in targets]
+    rewards = [t['rewards'] for t in targets]
+    min_tier = [t['min_tier'] for t in targets]
+    tier_of = [t['tier'] for t in targets]
+    median_log = math.log(behave['median_session_hours'])
+    jitter = behave['daily_jitter']
+    skip_chance = behave['skip_day_chance']
+    inf = float('inf')
+
+    reached = array('d', [-1.0]) * (players * n_targets)   # hours until reached, -1 if never
+    final_tier = array('i', [0]) * players
+    final_money = array('d', [0.0]) * players
+
+    for p in range(players):
+        session = rng.lognormvariate(median_log, behave['session_spread'])
+        skill = rng.lognormvariate(0.0, behave['skill_spread'])
+        scaled = [(tuple(r * skill for r in active), idle) for active, idle in tier_rates]
+        state = list(config['start'])
+        tier = 0
+        pending = list(range(n_targets))
+        base = p * n_targets
+        clock = 0.0
+
+        for _ in range(days):
+            if rng.random() < skip_chance:
+                hours = 0.0
+            else:
+                hours = min(24.0, session * rng.uniform(1.0 - jitter, 1.0 + jitter))
+            for seg_hours, active in ((hours, True), (24.0 - hours, False)):
+                remaining = seg_hours * 3600.0
+                while remaining > 0.0:
+                    rates = scaled[tier][0] if active else scaled[tier][1]
+                    best, best_dt = -1, remaining
+                    for k in pending:
+                        if min_tier[k] > tier:
+                            continue
+                        dt = 0.0
+                        for slot, threshold in reqs[k]:
+                            gap = threshold - state[slot]
+                            if gap > 1e-9:
+                                rate = rates[slot]
+                                need = gap / rate if rate > 0.0 else inf
+                                if need > dt:
+                                    dt = need
+                        if dt <= best_dt:
+                            best, best_dt = k, dt
+                    if best_dt > 0.0:
+                        for slot in range(SLOT_COUNT):
+                            state[slot] += rates[slot] * best_dt
+                        clock += best_dt
+                        remaining -= best_dt
+                    if best < 0:
+                        break
+                    pending.remove(best)
+                    reached[base + best] = clock / 3600.0
+                    for slot, amount in rewards[best]:
+                        state[slot] += amount
+                    if tier_of[best] is not None:
+                        tier = tier_of[best]
+
+        final_tier[p] = tier
+        final_money[p] = state[MONEY]
+
+    return {'players': players, 'reached': reached, 'final_tier': final_tier, 'final_money': final_money}
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(math.ceil(pct / 100.0 * len(sorted_values))))
+    return round(sorted_values[rank - 1], 2)
+
+
+def summarize(config, cohorts, players, days):
+    """Merge cohort arrays into time-to-milestone distributions."""
+    targets = config['targets']
+    n_targets = len(targets)
+    milestones = {}
+    for k, target in enumerate(targets):
+        times = []
+        for cohort in cohorts:
+            reached = cohort['reached']
+            times.extend(v for v in reached[k::n_targets] if v >= 0.0)
+        times.sort()
+        summary = {
+            'reached': len(times),
+            'reached_pct': round(len(times) / players * 100, 1) if players else 0,
+            'mean_hours': round(sum(times) / len(times), 2) if times else None,
+        }
+        for pct in PERCENTILES:
+            summary[f'p{pct}_hours'] = _percentile(times, pct)
+        milestones[target['key']] = summary
+
+    tier_counts = [0] * len(config['tier_ids'])
+    money = []
+    for cohort in cohorts:
+        for tier in cohort['final_tier']:
+            tier_counts[tier] += 1
+        money.extend(cohort['final_money'])
+    money.sort()
+
+    return {
+        'players': players,
+        'days': days,
+        'multipliers': config['multipliers'],
+        'behaviour': config['behaviour'],
+        'milestones': milestones,
+        'final_tiers': dict(zip(config['tier_ids'], tier_counts)),
+        'final_money': {f'p{pct}': _percentile(money, pct) for pct in PERCENTILES},
+        'unmodelled': config['unmodelled'],
+    }
+
+
+def run_simulation(config, players=1000, days=30, seed=0, workers=None, cohort_size=2000):
+    """
+    Simulate `players` synthetic players for `days` of game time, spreading
+    cohorts across a process pool. With one worker the cohorts run inline.
+    """
+    started = time.perf_counter()
+    workers = max(1, workers or os.cpu_count() or 1)
+    sizes = [min(cohort_size, players - start) for start in range(0, players, cohort_size)]
+    seeds = [seed * 1000003 + index for index in range(len(sizes))]
+
+    if workers == 1 or len(sizes) == 1:
+        cohorts = [simulate_cohort(config, n, days, s) for n, s in zip(sizes, seeds)]
+    else:
+        # Never fork: the API worker calling this runs background threads whose
+        # locks a forked child could inherit mid-acquire
+        with ProcessPoolExecutor(max_workers=min(workers, len(sizes)),
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            cohorts = list(pool.map(simulate_cohort, [config] * len(sizes), sizes, [days] * len(sizes), seeds))
+
+    result = summarize(config, cohorts, players, days)
+    result['seed'] = seed
+    result['workers'] = workers
+    result['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+# ===== CLI =====
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate economy progression for balance tuning.')
+    parser.add_argument('--players', type=int, default=10000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help='process pool size (default: CPU count)')
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--database', help='read GlobalGameState multipliers from this SQLite file')
+    parser.add_argument('--base-production-rate', type=float)
+    parser.add_argument('--global-multiplier', type=float)
+    args = parser.parse_args()
+
+    multipliers = load_db_multipliers(args.database) if args.database else dict(DEFAULT_MULTIPLIERS)
+    if args.base_production_rate is not None:
+        multipliers['base_production_rate'] = args.base_production_rate
+    if args.global_multiplier is not None:
+        multipliers['global_multiplier'] = args.global_multiplier
+
+    config = build_config(load_tuning_data(args.data_dir), multipliers)
+    result = run_simulation(config, args.players, args.days, args.seed, args.workers)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
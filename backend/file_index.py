@@ -0,0 +1,249 @@
+"""
+Watched index of the game data files behind the /admin/files browser.
+Keeps size, mtime, content hash and JSON validity for every file and
+refreshes them from a background watcher (inotify on Linux, mtime polling
+elsewhere), so listing the files is an in-memory read.
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import select
+import struct
+import threading
+import time
+from datetime import datetime
+
+INDEXED_EXTENSIONS = ('.json', '.lua')
+POLL_INTERVAL = 2.0
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MODIFY | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def describe_file(filepath, relpath, stat):
+    """Build the index entry for one file, hashing and parsing its content."""
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    filename = os.path.basename(filepath)
+    valid_json = None
+    if filename.endswith('.json'):
+        try:
+            json.loads(raw)
+            valid_json = True
+        except ValueError:
+            valid_json = False
+    return {
+        'name': filename,
+        'path': relpath,
+        'size': stat.st_size,
+        'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
+        'type': filename.split('.')[-1],
+        'editable': filename.endswith('.json'),
+        'sha256': hashlib.sha256(raw).hexdigest(),
+        'valid_json': valid_json,
+        '_mtime_ns': stat.st_mtime_ns,
+    }
+
+
+class FileIndex:
+    """
+    In-memory index of the data files under `root`. Entries are only
+    re-hashed when their size or mtime changes; the sorted listing and the
+    index hash are rebuilt on change, so reads never touch the filesystem.
+    """
+
+    def __init__(self, root, extensions=INDEXED_EXTENSIONS, poll_interval=POLL_INTERVAL):
+        self.root = root
+        self.extensions = extensions
+        self.poll_interval = poll_interval
+        self.watcher = None
+        self._entries = {}
+        self._listing = []
+        self._hash = None
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._inotify = None
+        self._thread = None
+
+    # ----- reads -----
+
+    def listing(self):
+        """Return (files, index_hash) for the current index."""
+        self.ensure_started()
+        return self._listing, self._hash
+
+    # ----- updates -----
+
+    def _publish(self):
+        """Rebuild the public listing and index hash. Caller holds the lock."""
+        files = sorted(
+            ({k: v for k, v in entry.items() if not k.startswith('_')} for entry in self._entries.values()),
+            key=lambda x: x['name']
+        )
+        digest = hashlib.sha256()
+        for entry in files:
+            digest.update(f"{entry['path']}\0{entry['sha256']}\0".encode('utf-8'))
+        self._listing = files
+        self._hash = digest.hexdigest()
+
+    def _scan(self):
+        found = {}
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith(self.extensions):
+                    filepath = os.path.join(dirpath, filename)
+                    found[os.path.relpath(filepath, self.root)] = filepath
+        return found
+
+    def refresh(self):
+        """Full rescan; only files whose size or mtime changed are re-read."""
+        with self._lock:
+            changed = False
+            found = self._scan()
+            for relpath in list(self._entries):
+                if relpath not in found:
+                    del self._entries[relpath]
+                    changed = True
+            for relpath, filepath in found.items():
+                changed |= self._update_entry(relpath, filepath)
+            if changed or self._hash is None:
+                self._publish()
+            return changed
+
+    def update_paths(self, paths):
+        """Re-index specific absolute paths (created, changed or deleted)."""
+        with self._lock:
+            changed = False
+            for filepath in paths:
+                if not filepath.endswith(self.extensions):
+                    continue
+                relpath = os.path.relpath(filepath, self.root)
+                if relpath.startswith('..'):
+                    continue
+                if os.path.isfile(filepath):
+                    changed |= self._update_entry(relpath, filepath)
+                elif self._entries.pop(relpath, None) is not None:
+                    changed = True
+            if changed:
+                self._publish()
+            return changed
+
+    def _update_entry(self, relpath, filepath):
+        """Refresh one entry if its size/mtime changed. Caller holds the lock."""
+        try:
+            stat = os.stat(filepath)
+            current = self._entries.get(relpath)
+            if current and current['size'] == stat.st_size and current['_mtime_ns'] == stat.st_mtime_ns:
+                return False
+            entry = describe_file(filepath, relpath, stat)
+        except OSError:
+            # File vanished between the scan and the read
+            return self._entries.pop(relpath, None) is not None
+        self._entries[relpath] = entry
+        return True
+
+    # ----- watcher -----
+
+    def ensure_started(self):
+        """Build the index and start the background watcher on first use."""
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            # Watch before the initial scan so no change slips in between
+            self._inotify = _Inotify.create()
+            if self._inotify is not None:
+                self._inotify.add_tree(self.root)
+            self.watcher = 'inotify' if self._inotify is not None else 'polling'
+            self.refresh()
+            thread = threading.Thread(target=self._watch, name='file-index-watcher', daemon=True)
+            thread.start()
+            self._thread = thread
+
+    def _watch(self):
+        if self._inotify is None:
+            while True:
+                time.sleep(self.poll_interval)
+                self._safe(self.refresh)
+        while True:
+            paths, rescan = self._inotify.read_events()
+            if rescan:
+                self._inotify.add_tree(self.root)
+                self._safe(self.refresh)
+            elif paths:
+                self._safe(self.update_paths, paths)
+
+    @staticmethod
+    def _safe(fn, *args):
+        # The watcher must outlive transient filesystem errors
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f"⚠️  File index refresh failed: {e}")
+
+
+class _Inotify:
+    """Minimal ctypes binding to Linux inotify, watching a directory tree."""
+
+    def __init__(self, libc, fd):
+        self.libc = libc
+        self.fd = fd
+        self.watches = {}
+
+    @classmethod
+    def create(cls):
+        if not hasattr(select, 'poll'):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        return cls(libc, fd) if fd >= 0 else None
+
+    def add_tree(self, root):
+        for dirpath, _, _ in os.walk(root):
+            if dirpath in self.watches.values():
+                continue
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd >= 0:
+                self.watches[wd] = dirpath
+
+    def read_events(self):
+        """Block until events arrive; return (changed file paths, needs full rescan)."""
+        poller = select.poll()
+        poller.register(self.fd, select.POLLIN)
+        poller.poll()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set(), False
+        paths, rescan, offset = set(), False, 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += length
+            if mask & (IN_Q_OVERFLOW | IN_ISDIR | IN_DELETE_SELF):
+                rescan = True
+                if mask & IN_DELETE_SELF:
+                    self.watches.pop(wd, None)
+            elif wd in self.watches and name:
+                paths.add(os.path.join(self.watches[wd], name))
+        return paths, rescan
@@ -3,14 +3,26 @@ Database models for the Cyberspace Tycoon idle game backend.
 Handles player data and global game state persistence.
 """
 
+from flask import jsonify, request
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+import json
 import time
+import unicodedata
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import validates
 
 # Initialize SQLAlchemy
 db = SQLAlchemy()
 
+# External-content FTS5 table indexing players.username_normalized as trigrams
+USERNAME_FTS_TABLE = 'players_username_fts'
+
+
+def normalize_username(username):
+    """Case-folded, NFKC-normalized form used for username search."""
+    return unicodedata.normalize('NFKC', username).casefold() if username is not None else None
+
 
 class Player(db.Model):
     """Player model storing individual player game state."""
@@ -22,6 +34,8 @@ class Player(db.Model):
     
     # Player identification
     username = db.Column(db.String(50), unique=True, nullable=False)
+    # Search key kept in sync with username; backs prefix and substring search
+    username_normalized = db.Column(db.String(50), index=True, nullable=True)
     
     # Core game resources
     current_currency = db.Column(db.Integer, default=0, nullable=False)
@@ -49,6 +63,11 @@ class Player(db.Model):
             'last_login': self.last_login.isoformat() if self.last_login else None,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
+    
+    @validates('username')
+    def _sync_username_normalized(self, key, username):
+        self.username_normalized = normalize_username(username)
+        return username
 
 
 class GlobalGameState(db.Model):
@@ -82,10 +101,75 @@ class GlobalGameState(db.Model):
         }
 
 
-def init_db(app):
-    """Initialize database with app context and create default global state."""
-    db.init_app(app)
+class AdminJob(db.Model):
+    """Background set-based admin operation over the players table, run in chunks."""
+    
+    __tablename__ = 'admin_jobs'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    
+    # Job definition (JSON-encoded, normalized at creation)
+    operation = db.Column(db.Text, nullable=False)
+    filters = db.Column(db.Text, nullable=False, default='[]')
+    chunk_size = db.Column(db.Integer, default=500, nullable=False)
+    
+    # pending -> running -> completed | cancelled | failed
+    status = db.Column(db.String(20), default='pending', nullable=False, index=True)
+    cancel_requested = db.Column(db.Boolean, default=False, nullable=False)
+    error = db.Column(db.Text, nullable=True)
     
+    # Progress; last_player_id is the keyset cursor a restarted job resumes from
+    total = db.Column(db.Integer, nullable=True)
+    processed = db.Column(db.Integer, default=0, nullable=False)
+    last_player_id = db.Column(db.Integer, default=0, nullable=False)
+    
+    # Runner ownership; a claim whose heartbeat goes stale can be taken over
+    claimed_by = db.Column(db.String(64), nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    
+    def to_dict(self):
+        """Convert job state to dictionary for JSON serialization."""
+        if self.status == 'completed':
+            progress = 100.0
+        else:
+            progress = round(self.processed / self.total * 100, 1) if self.total else 0.0
+        return {
+            'id': self.id,
+            'operation': json.loads(self.operation),
+            'filters': json.loads(self.filters),
+            'chunk_size': self.chunk_size,
+            'status': self.status,
+            'cancel_requested': self.cancel_requested,
+            'error': self.error,
+            'total': self.total,
+            'processed': self.processed,
+            'progress_pct': progress,
+            'last_player_id': self.last_player_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+# Bump whenever the models change; stored in SQLite's PRAGMA user_version
+SCHEMA_VERSION = 3
+
+# Requests that must work before the schema has been verified
+SCHEMA_CHECK_EXEMPT_ENDPOINTS = ('health_check', 'static')
+
+
+def create_schema(app):
+    """
+    One-shot schema setup: create all tables, the default global state and
+    record SCHEMA_VERSION, and switch the database to WAL journal mode so
+    readers (admin queries, read-replica snapshots) never block game saves.
+    Safe to run repeatedly.
+    """
     with app.app_context():
         # Create all tables with retry logic to handle brief SQLITE locks
         max_retries = 5
@@ -124,4 +208,116 @@ def init_db(app):
             try:
                 db.session.close()
             except Exception:
-                pass
\ No newline at end of file
+                pass
+
+        with db.engine.begin() as conn:
+            install_username_search(conn)
+            conn.exec_driver_sql(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+        # Persistent database setting; cannot be changed inside a transaction
+        with db.engine.connect() as conn:
+            conn.exec_driver_sql('PRAGMA journal_mode=WAL')
+
+
+def install_username_search(conn, batch_size=10000):
+    """
+    Add and backfill players.username_normalized on databases created before
+    it existed, then create the trigram FTS5 index and the triggers that keep
+    it in sync with inserts, renames and deletes. Idempotent.
+    """
+    columns = {row[1] for row in conn.exec_driver_sql('PRAGMA table_info(players)')}
+    if 'username_normalized' not in columns:
+        conn.exec_driver_sql('ALTER TABLE players ADD COLUMN username_normalized VARCHAR(50)')
+    conn.exec_driver_sql(
+        'CREATE INDEX IF NOT EXISTS ix_players_username_normalized ON players (username_normalized)'
+    )
+
+    # Backfill in batches; casefold() is not available in SQL
+    while True:
+        rows = conn.exec_driver_sql(
+            'SELECT id, username FROM players WHERE username_normalized IS NULL LIMIT ?', (batch_size,)
+        ).fetchall()
+        if not rows:
+            break
+        conn.exec_driver_sql(
+            'UPDATE players SET username_normalized = ? WHERE id = ?',
+            [(normalize_username(username), player_id) for player_id, username in rows]
+        )
+
+    exists = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (USERNAME_FTS_TABLE,)
+    ).first()
+    if exists:
+        return
+    try:
+        conn.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE {USERNAME_FTS_TABLE} USING fts5("
+            f"username_normalized, content='players', content_rowid='id', tokenize='trigram')"
+        )
+    except OperationalError as e:
+        # SQLite older than 3.34 has no trigram tokenizer; substring search falls back to LIKE
+        print(f"⚠️  Username substring index unavailable: {e}")
+        return
+    conn.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS players_username_fts_ai AFTER INSERT ON players BEGIN
+            INSERT INTO {USERNAME_FTS_TABLE}(rowid, username_normalized)
+            VALUES (new.id, new.username_normalized);
+        END""")
+    conn.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS players_username_fts_ad AFTER DELETE ON players BEGIN
+            INSERT INTO {USERNAME_FTS_TABLE}({USERNAME_FTS_TABLE}, rowid, username_normalized)
+            VALUES ('delete', old.id, old.username_normalized);
+        END""")
+    conn.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS players_username_fts_au AFTER UPDATE OF username_normalized ON players BEGIN
+            INSERT INTO {USERNAME_FTS_TABLE}({USERNAME_FTS_TABLE}, rowid, username_normalized)
+            VALUES ('delete', old.id, old.username_normalized);
+            INSERT INTO {USERNAME_FTS_TABLE}(rowid, username_normalized)
+            VALUES (new.id, new.username_normalized);
+        END""")
+    conn.exec_driver_sql(f"INSERT INTO {USERNAME_FTS_TABLE}({USERNAME_FTS_TABLE}) VALUES ('rebuild')")
+
+
+def get_schema_version():
+    """Read the schema version recorded in the database file header."""
+    with db.engine.connect() as conn:
+        return conn.exec_driver_sql('PRAGMA user_version').scalar()
+
+
+def _install_schema_check(app):
+    """
+    Verify the schema version on the first request instead of at import.
+    The result is cached for the life of the worker, so only the first
+    request opens a connection for it.
+    """
+    state = {'verified': False}
+
+    @app.before_request
+    def verify_schema_version():
+        if state['verified'] or request.endpoint in SCHEMA_CHECK_EXEMPT_ENDPOINTS:
+            return None
+        version = get_schema_version()
+        if version != SCHEMA_VERSION:
+            return jsonify({
+                'error': f'Database schema version {version} does not match {SCHEMA_VERSION}; '
+                         'run `flask --app app init-db`'
+            }), 503
+        state['verified'] = True
+        return None
+
+
+def init_db(app, lazy=False):
+    """
+    Initialize database with app context.
+
+    By default the schema is created at import (single-process development).
+    With lazy=True nothing touches the database until the first request, which
+    only checks the schema version written by `flask --app app init-db`; use it
+    when booting several workers so they never contend for the SQLite lock.
+    """
+    db.init_app(app)
+
+    if lazy:
+        _install_schema_check(app)
+    else:
+        create_schema(app)
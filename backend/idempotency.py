@@ -0,0 +1,282 @@
+"""
+Idempotency-Key support for game client writes.
+The first request with a given key runs normally and its response is
+cached; retries with the same key replay that response without touching
+the game database. Results live in a bounded, TTL-evicted in-memory cache
+and, optionally, in a small SQLite file shared by every worker process.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, jsonify, request
+
+from content_negotiation import JSON_MIMETYPE, MSGPACK_MIMETYPE, wants_msgpack
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_TTL = 24 * 3600     # seconds a completed response can be replayed
+PENDING_TTL = 60            # seconds an in-flight claim blocks duplicates before it is presumed dead
+PURGE_EVERY = 500           # store writes between sweeps of expired rows
+
+# Outcomes of IdempotencyCache.begin()
+PROCEED = 'proceed'
+REPLAY = 'replay'
+IN_PROGRESS = 'in_progress'
+MISMATCH = 'mismatch'
+
+
+class _SQLiteStore:
+    """Cross-worker result table in its own SQLite file, off the game database's write lock."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        conn = self._connect()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS idempotency_keys ('
+            ' key TEXT PRIMARY KEY,'
+            ' fingerprint TEXT NOT NULL,'
+            ' status INTEGER,'
+            ' body BLOB,'
+            ' mimetype TEXT,'
+            ' expires_at REAL NOT NULL)'
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, now):
+        return self._connect().execute(
+            'SELECT fingerprint, status, body, mimetype, expires_at FROM idempotency_keys '
+            'WHERE key = ? AND expires_at > ?', (key, now)
+        ).fetchone()
+
+    def claim(self, key, fingerprint, now):
+        """Insert a pending row; False if a live row for the key already exists."""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM idempotency_keys WHERE key = ? AND expires_at <= ?', (key, now))
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO idempotency_keys (key, fingerprint, expires_at) VALUES (?, ?, ?)',
+                (key, fingerprint, now + PENDING_TTL)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return cursor.rowcount == 1
+
+    def complete(self, key, fingerprint, status, body, mimetype, expires_at):
+        conn = self._connect()
+        conn.execute(
+            'INSERT OR REPLACE INTO idempotency_keys (key, fingerprint, status, body, mimetype, expires_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)', (key, fingerprint, status, body, mimetype, expires_at)
+        )
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            conn.execute('DELETE FROM idempotency_keys WHERE expires_at <= ?', (time.time(),))
+
+    def release(self, key, fingerprint):
+        self._connect().execute(
+            'DELETE FROM idempotency_keys WHERE key = ? AND fingerprint = ? AND status IS NULL',
+            (key, fingerprint)
+        )
+
+
+class IdempotencyCache:
+    """
+    Completed responses keyed by (endpoint, Idempotency-Key). The in-memory
+    layer is an LRU capped at `max_entries`; entries expire after `ttl`
+    seconds. With `store_path` set, results and in-flight claims are also
+    kept in SQLite so a retry landing on another worker is still deduplicated.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, store_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.store_path = store_path
+        self._store = None
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._store_lock = threading.Lock()
+        self._counts = {'hits': 0, 'memory_hits': 0, 'store_hits': 0, 'misses': 0,
+                        'in_progress': 0, 'mismatches': 0}
+
+    @property
+    def store(self):
+        # Opened on first use so importing the app never creates the file
+        if self.store_path and self._store is None:
+            with self._store_lock:
+                if self._store is None:
+                    self._store = _SQLiteStore(self.store_path)
+        return self._store
+
+    # ----- lookups -----
+
+    def _count(self, *names):
+        with self._lock:
+            for name in names:
+                self._counts[name] += 1
+
+    def _memory_get(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _memory_put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def begin(self, key, fingerprint):
+        """
+        Decide what to do with a keyed request. Returns (outcome, entry) where
+        entry is (expires_at, fingerprint, status, body, mimetype) for REPLAY.
+        """
+        now = time.time()
+        entry = self._memory_get(key, now)
+        source = 'memory_hits'
+        if entry is None and self.store is not None:
+            row = self.store.get(key, now)
+            if row is not None and row[1] is not None:
+                entry = (row[4], row[0], row[1], row[2], row[3])
+                self._memory_put(key, entry)
+                source = 'store_hits'
+            elif row is not None:
+                if row[0] != fingerprint:
+                    self._count('mismatches')
+                    return MISMATCH, None
+                self._count('in_progress')
+                return IN_PROGRESS, None
+
+        if entry is not None:
+            if entry[1] != fingerprint:
+                self._count('mismatches')
+                return MISMATCH, None
+            self._count('hits', source)
+            return REPLAY, entry
+
+        with self._lock:
+            if key in self._pending:
+                self._counts['in_progress'] += 1
+                return IN_PROGRESS, None
+            self._pending[key] = fingerprint
+        if self.store is not None and not self.store.claim(key, fingerprint, now):
+            with self._lock:
+                self._pending.pop(key, None)
+                self._counts['in_progress'] += 1
+            return IN_PROGRESS, None
+        self._count('misses')
+        return PROCEED, None
+
+    def finish(self, key, fingerprint, status, body, mimetype):
+        """Cache the response of a request that went through begin() -> PROCEED."""
+        entry = (time.time() + self.ttl, fingerprint, status, body, mimetype)
+        self._memory_put(key, entry)
+        with self._lock:
+            self._pending.pop(key, None)
+        if self.store is not None:
+            self.store.complete(key, fingerprint, status, body, mimetype, entry[0])
+
+    def abandon(self, key, fingerprint):
+        """Drop the claim of a request that failed, so a retry runs it again."""
+        with self._lock:
+            self._pending.pop(key, None)
+        if self.store is not None:
+            self.store.release(key, fingerprint)
+
+    def stats(self):
+        """Hit/miss counters for this process."""
+        with self._lock:
+            counts = dict(self._counts)
+            counts['entries'] = len(self._entries)
+        lookups = counts['hits'] + counts['misses']
+        counts['hit_rate'] = round(counts['hits'] / lookups, 4) if lookups else 0.0
+        counts['store'] = 'sqlite' if self.store_path else None
+        return counts
+
+
+def request_fingerprint():
+    """
+    Hash of what a replay must match: the request body and the response
+    encoding negotiated from Accept, since the cached body is already encoded.
+    """
+    digest = hashlib.sha256(request.get_data())
+    digest.update(b'\0' + (MSGPACK_MIMETYPE if wants_msgpack() else JSON_MIMETYPE).encode('ascii'))
+    return digest.hexdigest()
+
+
+def body_username():
+    """Scope for player endpoints: the username in the request body."""
+    data = request.get_json(silent=True)
+    username = data.get('username') if isinstance(data, dict) else None
+    return str(username).strip() if username is not None else ''
+
+
+def idempotent(cache, scope=None):
+    """
+    Decorator for POST views: requests carrying an Idempotency-Key header are
+    run at most once per key, request body and response encoding. `scope`
+    returns a string (e.g. the username) that namespaces keys, so clients that
+    happen to generate the same key do not collide. Responses with status
+    >= 500 are not cached, so a retry after a server error is executed again.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if key is None:
+                return view(*args, **kwargs)
+            key = key.strip()
+            if not key or len(key) > MAX_KEY_LENGTH:
+                return jsonify({'error': f'{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters'}), 400
+
+            scoped_key = f'{request.endpoint}:{scope() if scope else ""}:{key}'
+            fingerprint = request_fingerprint()
+            outcome, entry = cache.begin(scoped_key, fingerprint)
+            if outcome == REPLAY:
+                response = current_app.response_class(entry[3], status=entry[2], mimetype=entry[4])
+                response.headers[REPLAYED_HEADER] = 'true'
+                return response
+            if outcome == IN_PROGRESS:
+                return jsonify({'error': 'A request with this Idempotency-Key is still being processed'}), 409
+            if outcome == MISMATCH:
+                return jsonify({'error': 'Idempotency-Key was already used with a different request body or Accept'}), 422
+
+            try:
+                response = current_app.make_response(view(*args, **kwargs))
+            except Exception:
+                cache.abandon(scoped_key, fingerprint)
+                raise
+            if response.status_code >= 500:
+                cache.abandon(scoped_key, fingerprint)
+            else:
+                cache.finish(scoped_key, fingerprint, response.status_code,
+                             response.get_data(), response.mimetype)
+            return response
+        return wrapper
+    return decorator
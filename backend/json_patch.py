@@ -0,0 +1,247 @@
+"""
+RFC 6902 JSON Patch support for partial updates of game data files.
+Patches are applied copy-on-write to a cached parsed document: only the
+containers along each patched path are copied, so unchanged subtrees keep
+their identity and validators can skip them.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows: patches are then only serialized per process
+    fcntl = None
+
+
+class PatchError(ValueError):
+    """The patch document is malformed or cannot be applied."""
+
+
+class PatchConflict(PatchError):
+    """A `test` operation failed against the current document."""
+
+
+def parse_pointer(pointer):
+    """Split an RFC 6901 JSON Pointer into unescaped reference tokens."""
+    if not isinstance(pointer, str):
+        raise PatchError('JSON Pointer must be a string')
+    if pointer == '':
+        return []
+    if not pointer.startswith('/'):
+        raise PatchError(f'Invalid JSON Pointer: {pointer!r}')
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+def _array_index(container, token, allow_end=False):
+    if allow_end and token == '-':
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token[0] == '0'):
+        raise PatchError(f'Invalid array index: {token!r}')
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise PatchError(f'Array index out of range: {index}')
+    return index
+
+
+def json_equal(a, b):
+    """
+    RFC 6902 `test` equality: same JSON type and value, compared recursively.
+    Booleans and null never equal numbers; numbers compare by value.
+    """
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(json_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(json_equal(x, y) for x, y in zip(a, b))
+    return type(a) is type(b) and a == b
+
+
+def resolve(document, tokens):
+    """Return the value a token list points at."""
+    node = document
+    for token in tokens:
+        if isinstance(node, dict):
+            if token not in node:
+                raise PatchError(f'Path not found: /{"/".join(tokens)}')
+            node = node[token]
+        elif isinstance(node, list):
+            node = node[_array_index(node, token)]
+        else:
+            raise PatchError(f'Path not found: /{"/".join(tokens)}')
+    return node
+
+
+class _Patcher:
+    """Applies operations copy-on-write; `owned` holds ids of containers copied by this patch."""
+
+    def __init__(self, document):
+        self.root = document
+        self.owned = set()
+
+    def _own(self, container):
+        if id(container) in self.owned:
+            return container
+        private = list(container) if isinstance(container, list) else dict(container)
+        self.owned.add(id(private))
+        return private
+
+    def _parent(self, tokens):
+        """Return the private parent container of the last token."""
+        if not isinstance(self.root, (dict, list)):
+            raise PatchError('Cannot patch inside a scalar document')
+        self.root = self._own(self.root)
+        node = self.root
+        for token in tokens[:-1]:
+            key = token if isinstance(node, dict) else _array_index(node, token)
+            if isinstance(node, dict) and key not in node:
+                raise PatchError(f'Path not found: /{"/".join(tokens)}')
+            child = node[key]
+            if not isinstance(child, (dict, list)):
+                raise PatchError(f'Path not found: /{"/".join(tokens)}')
+            child = self._own(child)
+            node[key] = child
+            node = child
+        return node
+
+    def add(self, tokens, value):
+        if not tokens:
+            self.root = value
+            return
+        parent = self._parent(tokens)
+        if isinstance(parent, list):
+            parent.insert(_array_index(parent, tokens[-1], allow_end=True), value)
+        else:
+            parent[tokens[-1]] = value
+
+    def remove(self, tokens):
+        if not tokens:
+            raise PatchError('Cannot remove the document root')
+        parent = self._parent(tokens)
+        if isinstance(parent, list):
+            return parent.pop(_array_index(parent, tokens[-1]))
+        if tokens[-1] not in parent:
+            raise PatchError(f'Path not found: /{"/".join(tokens)}')
+        return parent.pop(tokens[-1])
+
+    def replace(self, tokens, value):
+        if not tokens:
+            self.root = value
+            return
+        resolve(self.root, tokens)
+        parent = self._parent(tokens)
+        key = _array_index(parent, tokens[-1]) if isinstance(parent, list) else tokens[-1]
+        parent[key] = value
+
+    def apply(self, operation):
+        if not isinstance(operation, dict) or 'op' not in operation or 'path' not in operation:
+            raise PatchError('Each operation must be an object with "op" and "path"')
+        op = operation['op']
+        tokens = parse_pointer(operation['path'])
+        if op in ('add', 'replace', 'test') and 'value' not in operation:
+            raise PatchError(f'"{op}" operation requires a value')
+
+        if op == 'add':
+            self.add(tokens, operation['value'])
+        elif op == 'remove':
+            self.remove(tokens)
+        elif op == 'replace':
+            self.replace(tokens, operation['value'])
+        elif op in ('move', 'copy'):
+            source = parse_pointer(operation.get('from'))
+            if op == 'move':
+                if tokens[:len(source)] == source and tokens != source:
+                    raise PatchError('Cannot move a value into one of its children')
+                self.add(tokens, self.remove(source))
+            else:
+                self.add(tokens, copy.deepcopy(resolve(self.root, source)))
+        elif op == 'test':
+            if not json_equal(resolve(self.root, tokens), operation['value']):
+                raise PatchConflict(f'Test failed at {operation["path"]}')
+        else:
+            raise PatchError(f'Unknown operation: {op!r}')
+
+
+def apply_patch(document, patch):
+    """
+    Apply an RFC 6902 patch and return the new document. The input is never
+    mutated; the result shares every container the patch did not touch.
+    """
+    if not isinstance(patch, list):
+        raise PatchError('JSON Patch must be an array of operations')
+    patcher = _Patcher(document)
+    for operation in patch:
+        patcher.apply(operation)
+    return patcher.root
+
+
+def changed_items(original, patched):
+    """
+    Entries of a top-level array or object that are new or were rewritten by
+    apply_patch, judged by identity. Returns None if the root type changed.
+    """
+    if type(original) is not type(patched) or not isinstance(patched, (list, dict)):
+        return None
+    if isinstance(patched, list):
+        before = {id(item) for item in original}
+        return [item for item in patched if id(item) not in before]
+    return {key: value for key, value in patched.items()
+            if key not in original or original[key] is not value}
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Exclusive lock on a sidecar `<path>.lock` file, held across processes, so
+    a base-hash check and the write that follows it are atomic between workers.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(f'{path}.lock', 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+class DocumentCache:
+    """
+    Parsed JSON documents keyed by path, reused while the file's size and
+    mtime are unchanged. Each entry carries the SHA-256 of the file bytes,
+    which is the base hash clients patch against.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self.lock = threading.RLock()
+
+    def load(self, path):
+        """Return (document, sha256) for the file at `path`."""
+        stat = os.stat(path)
+        with self.lock:
+            cached = self._entries.get(path)
+            if cached and cached[0] == (stat.st_size, stat.st_mtime_ns):
+                return cached[1], cached[2]
+            with open(path, 'rb') as f:
+                raw = f.read()
+            document = json.loads(raw)
+            digest = hashlib.sha256(raw).hexdigest()
+            self._entries[path] = ((stat.st_size, stat.st_mtime_ns), document, digest)
+            return document, digest
+
+    def store(self, path, document, raw):
+        """Record a document just written to `path` from the bytes `raw`."""
+        stat = os.stat(path)
+        digest = hashlib.sha256(raw).hexdigest()
+        with self.lock:
+            self._entries[path] = ((stat.st_size, stat.st_mtime_ns), document, digest)
+        return digest
@@ -0,0 +1,109 @@
+"""
+Username search for the admin panel.
+Prefix matches are range scans over the case-folded username index;
+substring matches use the trigram FTS5 index. Results are paginated
+with opaque keyset cursors, so deep pages cost the same as the first.
+"""
+
+import base64
+import json
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from game_data import db, Player, USERNAME_FTS_TABLE, normalize_username
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# Trigram matching needs at least three characters
+MIN_SUBSTRING_LENGTH = 3
+
+SEARCH_MODES = ('prefix', 'substring')
+
+
+class SearchError(ValueError):
+    """Invalid search parameters."""
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, UnicodeError):
+        raise SearchError('Invalid cursor')
+
+
+def _prefix_page(session, term, limit, cursor):
+    # Range over the index: term <= username_normalized < term + U+10FFFF
+    query = session.query(Player).filter(
+        Player.username_normalized >= term,
+        Player.username_normalized < term + '\U0010ffff'
+    )
+    if cursor:
+        last_name, last_id = decode_cursor(cursor)
+        query = query.filter(db.or_(
+            Player.username_normalized > last_name,
+            db.and_(Player.username_normalized == last_name, Player.id > last_id)
+        ))
+    players = query.order_by(Player.username_normalized, Player.id).limit(limit + 1).all()
+    next_cursor = None
+    if len(players) > limit:
+        players = players[:limit]
+        next_cursor = encode_cursor([players[-1].username_normalized, players[-1].id])
+    return players, next_cursor
+
+
+def _substring_ids(session, term, limit, after_id):
+    """Player ids whose username contains `term`, in id order, via FTS5 or a LIKE scan."""
+    phrase = '"' + term.replace('"', '""') + '"'
+    try:
+        rows = session.execute(text(
+            f'SELECT rowid FROM {USERNAME_FTS_TABLE} '
+            f'WHERE {USERNAME_FTS_TABLE} MATCH :phrase AND rowid > :after '
+            f'ORDER BY rowid LIMIT :limit'
+        ), {'phrase': phrase, 'after': after_id, 'limit': limit}).fetchall()
+        return [row[0] for row in rows]
+    except OperationalError:
+        # No trigram index on this SQLite build
+        session.rollback()
+        escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        rows = (session.query(Player.id)
+                .filter(Player.username_normalized.like(f'%{escaped}%', escape='\\'), Player.id > after_id)
+                .order_by(Player.id).limit(limit).all())
+        return [row[0] for row in rows]
+
+
+def _substring_page(session, term, limit, cursor):
+    after_id = decode_cursor(cursor)[0] if cursor else 0
+    ids = _substring_ids(session, term, limit + 1, after_id)
+    next_cursor = None
+    if len(ids) > limit:
+        ids = ids[:limit]
+        next_cursor = encode_cursor([ids[-1]])
+    by_id = {p.id: p for p in session.query(Player).filter(Player.id.in_(ids)).all()} if ids else {}
+    return [by_id[i] for i in ids if i in by_id], next_cursor
+
+
+def search_players(query, mode='prefix', limit=DEFAULT_LIMIT, cursor=None, session=None):
+    """
+    Return (players, next_cursor, mode_used). Substring queries shorter than
+    MIN_SUBSTRING_LENGTH are answered as prefix queries. `session` defaults
+    to the primary database session.
+    """
+    session = session or db.session
+    if mode not in SEARCH_MODES:
+        raise SearchError(f'mode must be one of: {", ".join(SEARCH_MODES)}')
+    term = normalize_username((query or '').strip())
+    if not term:
+        raise SearchError('Search query cannot be empty')
+    limit = max(1, min(MAX_LIMIT, int(limit)))
+
+    if mode == 'substring' and len(term) >= MIN_SUBSTRING_LENGTH:
+        players, next_cursor = _substring_page(session, term, limit, cursor)
+        return players, next_cursor, 'substring'
+    players, next_cursor = _prefix_page(session, term, limit, cursor)
+    return players, next_cursor, 'prefix'
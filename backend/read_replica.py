@@ -0,0 +1,140 @@
+"""
+Optional snapshot read-replica for admin and analytics reads.
+A background thread periodically copies the game database into a second
+file with the SQLite online backup API; dashboard queries then run against
+that copy so they never hold locks or evict page cache on the file that
+save_player writes to.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from json_patch import file_lock
+
+DEFAULT_REFRESH_INTERVAL = 10.0   # seconds between background snapshots
+DEFAULT_MAX_STALENESS = 60.0      # older snapshots are refreshed before serving a read
+
+
+class ReadReplica:
+    """
+    Snapshot copy of `source_path` at `path`. The snapshot's age is the
+    replica file's mtime, so every worker process sharing the file sees the
+    same age and only refreshes when the copy is actually due.
+    """
+
+    def __init__(self, source_path, path, refresh_interval=DEFAULT_REFRESH_INTERVAL,
+                 max_staleness=DEFAULT_MAX_STALENESS):
+        self.source_path = source_path
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.max_staleness = max_staleness
+        # NullPool: every session opens the current file, picking up replaced snapshots.
+        # immutable=1: a snapshot never changes once swapped in, so readers take no
+        # locks and need no -shm/-wal files or write access to the directory.
+        self.engine = create_engine(f'sqlite:///file:{path}?mode=ro&immutable=1&uri=true', poolclass=NullPool)
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+
+    # ----- snapshots -----
+
+    def age(self):
+        """Seconds since the current snapshot was taken, or None if there is none."""
+        try:
+            return max(0.0, time.time() - os.stat(self.path).st_mtime)
+        except OSError:
+            return None
+
+    def refresh(self, max_age=None):
+        """
+        Take a consistent snapshot of the source database and swap it in
+        atomically. Refreshes are serialized across worker processes; with
+        `max_age`, the copy is skipped if another worker produced a snapshot
+        younger than that while this one waited. Returns True if it copied.
+        """
+        with self._lock, file_lock(self.path):
+            if max_age is not None:
+                age = self.age()
+                if age is not None and age < max_age:
+                    return False
+            tmp = f'{self.path}.{os.getpid()}.tmp'
+            src = sqlite3.connect(self.source_path, timeout=30)
+            try:
+                dst = sqlite3.connect(tmp)
+                try:
+                    # One step (pages=-1) copies everything inside a single read
+                    # transaction; stepwise copies restart whenever a save lands.
+                    # With the game database in WAL mode (see create_schema) that
+                    # read transaction never blocks game writes.
+                    src.backup(dst)
+                    # The copy inherits WAL mode from the source header; a WAL file
+                    # must not be renamed over while readers hold the old inode open
+                    dst.execute('PRAGMA journal_mode=DELETE')
+                finally:
+                    dst.close()
+            finally:
+                src.close()
+            os.replace(tmp, self.path)
+            return True
+
+    def ensure_fresh(self, max_staleness=None):
+        """Refresh now if the snapshot is missing or older than the staleness bound."""
+        bound = self.max_staleness if max_staleness is None else max_staleness
+        age = self.age()
+        if age is None or age > bound:
+            self.refresh(max_age=bound)
+
+    # ----- background refresh -----
+
+    def ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._loop, name='read-replica-refresh', daemon=True)
+                thread.start()
+                self._thread = thread
+
+    def _loop(self):
+        while True:
+            try:
+                age = self.age()
+                if age is None or age >= self.refresh_interval:
+                    self.refresh(max_age=self.refresh_interval)
+                    age = self.age() or 0.0
+                wait = self.refresh_interval - age
+            except Exception as e:
+                print(f"⚠️  Read replica refresh failed: {e}")
+                wait = self.refresh_interval
+            time.sleep(max(0.5, wait))
+
+    # ----- reads -----
+
+    @contextmanager
+    def session(self, max_staleness=None):
+        """Yield a read-only ORM session on a snapshot no older than the bound."""
+        self.ensure_fresh(max_staleness)
+        session = Session(bind=self.engine)
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def describe(self):
+        """Replica metadata included in admin responses."""
+        age = self.age()
+        return {
+            'source': 'replica',
+            'age_seconds': round(age, 3) if age is not None else None,
+            'snapshot_at': (datetime.utcfromtimestamp(time.time() - age).isoformat()
+                            if age is not None else None),
+            'max_staleness_seconds': self.max_staleness
+        }
@@ -261,9 +261,14 @@ function displayDatabaseStats(stats) {
 }
 
 // File management
+let fileIndexHash = null;
+
 async function loadFiles() {
     try {
         const files = await apiGet('/admin/files');
+        // Skip re-rendering when no file changed since the last listing
+        if (files.index_hash && files.index_hash === fileIndexHash) return;
+        fileIndexHash = files.index_hash;
         displayFiles(files.files);
     } catch (error) {
         console.error('Failed to load files:', error);
@@ -291,6 +296,7 @@ function displayFiles(files) {
                         ${file.type.toUpperCase()}
                     </span>
                     ${file.editable ? '<span style="background: #27ae60; padding: 2px 6px; border-radius: 4px; font-size: 0.8em; margin-left: 4px;">✏️</span>' : ''}
+                    ${file.valid_json === false ? '<span style="background: #c0392b; padding: 2px 6px; border-radius: 4px; font-size: 0.8em; margin-left: 4px;">⚠️ Invalid JSON</span>' : ''}
                 </div>
             </div>
             <div style="font-size: 0.8em; color: #8fbcdb; margin-top: 4px;">
@@ -9,6 +9,8 @@ class EnhancedAdminDashboard {
         this.jsonEditor = null;
         this.fileData = new Map();
         this.fileSchemas = new Map();
+        this.fileBase = new Map();    // snapshot of each file as last loaded/saved
+        this.fileHashes = new Map();  // server content hash of that snapshot
         
         this.init();
     }
@@ -97,14 +99,19 @@ class EnhancedAdminDashboard {
                 throw new Error(`HTTP ${response.status}: ${await response.text()}`);
             }
             
+            let hash;
             if (fileName === 'currencies' || fileName === 'progression') {
                 const fileData = await response.json();
                 data = JSON.parse(fileData.content);
+                hash = fileData.sha256;
             } else {
                 data = await response.json();
+                hash = (response.headers.get('ETag') || '').replace(/^W\//, '').replace(/"/g, '');
             }
             
             this.fileData.set(fileName, data);
+            this.fileBase.set(fileName, JSON.parse(JSON.stringify(data)));
+            this.fileHashes.set(fileName, hash || null);
             this.fileSchemas.set(fileName, this.generateSchema(fileName, data));
             
             this.showNotification(`${fileName} loaded successfully`, 'success');
@@ -192,6 +199,12 @@ class EnhancedAdminDashboard {
         try {
             this.updateFileInfo('Saving changes...');
             
+            // Send only the changes when the server hash of the loaded copy is known
+            const baseHash = this.fileHashes.get(this.currentFile);
+            if (baseHash && this.fileBase.has(this.currentFile)) {
+                return await this.patchCurrentFile(data, baseHash);
+            }
+            
             let endpoint;
             let method = 'PUT';
             let body;
@@ -233,7 +246,10 @@ class EnhancedAdminDashboard {
             }
             
             // Update local cache
+            const result = await response.json();
             this.fileData.set(this.currentFile, data);
+            this.fileBase.set(this.currentFile, JSON.parse(JSON.stringify(data)));
+            this.fileHashes.set(this.currentFile, result.hash || null);
             
             this.showNotification(`${this.currentFile} saved successfully`, 'success');
             this.updateFileInfo(this.getFileDescription(this.currentFile));
@@ -282,6 +298,44 @@ class EnhancedAdminDashboard {
         }
     }
     
+    async patchCurrentFile(data, baseHash) {
+        const patch = createJsonPatch(this.fileBase.get(this.currentFile), data);
+        if (patch.length === 0) {
+            this.showNotification('No changes to save', 'info');
+            this.updateFileInfo(this.getFileDescription(this.currentFile));
+            return true;
+        }
+        
+        const endpoint = (this.currentFile === 'contracts' || this.currentFile === 'defs')
+            ? `/admin/data/${this.currentFile}`
+            : `/admin/files/${this.currentFile}.json`;
+        
+        const response = await fetch(endpoint, {
+            method: 'PATCH',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ base_hash: baseHash, patch })
+        });
+        
+        if (response.status === 409) {
+            this.showNotification(`${this.currentFile} was changed on the server; reload it before saving`, 'error');
+            this.updateFileInfo(this.getFileDescription(this.currentFile));
+            return false;
+        }
+        if (!response.ok) {
+            const errorText = await response.text();
+            throw new Error(`HTTP ${response.status}: ${errorText}`);
+        }
+        
+        const result = await response.json();
+        this.fileData.set(this.currentFile, data);
+        this.fileBase.set(this.currentFile, JSON.parse(JSON.stringify(data)));
+        this.fileHashes.set(this.currentFile, result.hash);
+        
+        this.showNotification(`${this.currentFile} saved (${patch.length} change${patch.length === 1 ? '' : 's'})`, 'success');
+        this.updateFileInfo(this.getFileDescription(this.currentFile));
+        return true;
+    }
+    
     showNotification(message, type = 'info') {
         const notification = document.getElementById('notification');
         notification.textContent = message;
@@ -522,6 +576,42 @@ function versionCompare() {
     }, 2000);
 }
 
+// Build an RFC 6902 JSON Patch turning `base` into `target`
+function createJsonPatch(base, target, path = '', ops = []) {
+    const isObject = (v) => v !== null && typeof v === 'object';
+    
+    if (Array.isArray(base) && Array.isArray(target)) {
+        const common = Math.min(base.length, target.length);
+        for (let i = 0; i < common; i++) {
+            createJsonPatch(base[i], target[i], `${path}/${i}`, ops);
+        }
+        // Remove from the end so earlier indices stay valid
+        for (let i = base.length - 1; i >= target.length; i--) {
+            ops.push({ op: 'remove', path: `${path}/${i}` });
+        }
+        for (let i = common; i < target.length; i++) {
+            ops.push({ op: 'add', path: `${path}/-`, value: target[i] });
+        }
+    } else if (isObject(base) && isObject(target) && !Array.isArray(base) && !Array.isArray(target)) {
+        const escape = (key) => key.replace(/~/g, '~0').replace(/\//g, '~1');
+        for (const key of Object.keys(base)) {
+            if (!(key in target)) {
+                ops.push({ op: 'remove', path: `${path}/${escape(key)}` });
+            }
+        }
+        for (const key of Object.keys(target)) {
+            if (key in base) {
+                createJsonPatch(base[key], target[key], `${path}/${escape(key)}`, ops);
+            } else {
+                ops.push({ op: 'add', path: `${path}/${escape(key)}`, value: target[key] });
+            }
+        }
+    } else if (JSON.stringify(base) !== JSON.stringify(target)) {
+        ops.push({ op: 'replace', path, value: target });
+    }
+    return ops;
+}
+
 // Initialize dashboard when DOM is loaded
 document.addEventListener('DOMContentLoaded', () => {
     window.adminDashboard = new EnhancedAdminDashboard();
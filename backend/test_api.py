@@ -123,6 +123,51 @@ def main():
     }, 409):
         tests_passed += 1
     
+    # Test 11: Economy simulation (admin)
+    total_tests += 1
+    if test_endpoint("POST", "/admin/simulate", {
+        "players": 200,
+        "days": 3,
+        "seed": 1
+    }):
+        tests_passed += 1
+    
+    # Test 12: Compiled game-data bundle
+    total_tests += 1
+    if test_endpoint("GET", "/api/data/bundle"):
+        tests_passed += 1
+    
+    # Test 13: Queue a bulk admin job (adds 0, limited to apitest_player's Test 4 values, so no player changes)
+    total_tests += 1
+    if test_endpoint("POST", "/admin/jobs", {
+        "operation": {"field": "mission_tokens", "op": "add", "value": 0},
+        "filter": {"xp": 1000, "mission_tokens": 2, "active_within_days": 1},
+        "chunk_size": 100
+    }, 202):
+        tests_passed += 1
+    
+    # Test 14: Username search (admin)
+    total_tests += 1
+    if test_endpoint("GET", "/admin/players/search?q=APITEST&mode=substring"):
+        tests_passed += 1
+    
+    # Test 15: Retried save with an Idempotency-Key is replayed
+    total_tests += 1
+    try:
+        headers = {'Idempotency-Key': f'apitest-{time.time()}'}
+        save = {"username": "apitest_player", "xp": 1200}
+        first = requests.post(f"{BASE_URL}/api/player/save", json=save, headers=headers)
+        retry = requests.post(f"{BASE_URL}/api/player/save", json=save, headers=headers)
+        if (first.status_code == 200 and retry.status_code == 200
+                and retry.headers.get('Idempotent-Replayed') == 'true'
+                and retry.json() == first.json()):
+            print("✅ POST /api/player/save - Idempotency-Key retry replayed")
+            tests_passed += 1
+        else:
+            print(f"❌ POST /api/player/save - Idempotency-Key retry not replayed: {retry.status_code}")
+    except requests.exceptions.RequestException as e:
+        print(f"❌ POST /api/player/save - Connection error: {e}")
+    
     print()
     print(f"📊 Test Results: {tests_passed}/{total_tests} tests passed")
     
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Checks of the economy simulator against the shipped tuning files.
+Run from the backend directory: python -m unittest test_economy_sim
+"""
+
+import unittest
+
+from economy_sim import build_config, load_tuning_data, run_simulation
+
+
+class ShippedProgressionTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.config = build_config(load_tuning_data())
+        cls.result = run_simulation(cls.config, players=500, days=30, seed=1, workers=1)
+
+    def test_specialist_gated_tiers_are_not_reached(self):
+        # growingCompany and above need specialists / mission tokens, which are not modelled
+        for tier_id in ('growingCompany', 'enterprise', 'cybersecGiant'):
+            self.assertIn(f'tier:{tier_id}', self.result['unmodelled'])
+            self.assertNotIn(f'tier:{tier_id}', self.result['milestones'])
+            self.assertEqual(self.result['final_tiers'][tier_id], 0)
+
+    def test_prestige_behind_unreachable_tier_is_not_reached(self):
+        self.assertEqual(self.result['milestones']['prestige_unlock']['reached'], 0)
+
+    def test_modelled_tiers_still_progress(self):
+        self.assertGreater(self.result['milestones']['tier:smallBusiness']['reached'], 0)
+        self.assertEqual(sum(self.result['final_tiers'].values()), 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the RFC 6902 JSON Patch support in json_patch.py and the
+PATCH endpoints built on it.
+Run from the backend directory: python -m unittest test_json_patch
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from data_bundle import DataBundle
+from file_index import FileIndex
+from json_patch import (
+    PatchConflict, PatchError, apply_patch, changed_items, json_equal, parse_pointer
+)
+
+
+class ApplyPatchTests(unittest.TestCase):
+
+    def test_add_object_member_and_array_end(self):
+        doc = {'a': [1, 2]}
+        result = apply_patch(doc, [
+            {'op': 'add', 'path': '/b', 'value': 3},
+            {'op': 'add', 'path': '/a/-', 'value': 4},
+            {'op': 'add', 'path': '/a/0', 'value': 0},
+        ])
+        self.assertEqual(result, {'a': [0, 1, 2, 4], 'b': 3})
+        self.assertEqual(doc, {'a': [1, 2]})
+
+    def test_remove(self):
+        self.assertEqual(apply_patch({'a': 1, 'b': [1, 2]}, [
+            {'op': 'remove', 'path': '/a'},
+            {'op': 'remove', 'path': '/b/0'},
+        ]), {'b': [2]})
+        with self.assertRaises(PatchError):
+            apply_patch({'a': 1}, [{'op': 'remove', 'path': '/missing'}])
+
+    def test_replace_requires_existing_target(self):
+        self.assertEqual(apply_patch({'a': 1}, [{'op': 'replace', 'path': '/a', 'value': 2}]), {'a': 2})
+        with self.assertRaises(PatchError):
+            apply_patch({'a': 1}, [{'op': 'replace', 'path': '/b', 'value': 2}])
+
+    def test_move_and_copy(self):
+        doc = {'a': {'x': 1}, 'b': []}
+        result = apply_patch(doc, [
+            {'op': 'copy', 'from': '/a', 'path': '/c'},
+            {'op': 'move', 'from': '/a/x', 'path': '/b/-'},
+        ])
+        self.assertEqual(result, {'a': {}, 'b': [1], 'c': {'x': 1}})
+        self.assertIsNot(result['c'], doc['a'])
+        with self.assertRaises(PatchError):
+            apply_patch(doc, [{'op': 'move', 'from': '/a', 'path': '/a/child'}])
+
+    def test_test_operation_is_type_sensitive(self):
+        self.assertEqual(apply_patch({'a': 1}, [{'op': 'test', 'path': '/a', 'value': 1}]), {'a': 1})
+        for value in (True, '1', None, [1]):
+            with self.assertRaises(PatchConflict):
+                apply_patch({'a': 1}, [{'op': 'test', 'path': '/a', 'value': value}])
+        with self.assertRaises(PatchConflict):
+            apply_patch({'a': [0, {'b': False}]}, [{'op': 'test', 'path': '/a', 'value': [False, {'b': 0}]}])
+
+    def test_json_equal(self):
+        self.assertTrue(json_equal({'a': [1, 'x', None]}, {'a': [1.0, 'x', None]}))
+        self.assertFalse(json_equal(True, 1))
+        self.assertFalse(json_equal(0, False))
+        self.assertFalse(json_equal(None, 0))
+        self.assertFalse(json_equal({'a': 1}, {'a': 1, 'b': 2}))
+
+    def test_array_indices(self):
+        doc = {'a': [1, 2, 3]}
+        self.assertEqual(apply_patch(doc, [{'op': 'replace', 'path': '/a/2', 'value': 9}])['a'], [1, 2, 9])
+        for path in ('/a/01', '/a/-1', '/a/x', '/a/4'):
+            with self.assertRaises(PatchError, msg=path):
+                apply_patch(doc, [{'op': 'add', 'path': path, 'value': 0}])
+        with self.assertRaises(PatchError):
+            apply_patch(doc, [{'op': 'replace', 'path': '/a/-', 'value': 0}])
+
+    def test_pointer_escaping(self):
+        self.assertEqual(parse_pointer('/a~1b/c~0d/~01'), ['a/b', 'c~d', '~1'])
+        self.assertEqual(parse_pointer(''), [])
+        with self.assertRaises(PatchError):
+            parse_pointer('a/b')
+        doc = {'a/b': {'m~n': 1}}
+        self.assertEqual(apply_patch(doc, [{'op': 'replace', 'path': '/a~1b/m~0n', 'value': 2}]),
+                         {'a/b': {'m~n': 2}})
+
+    def test_malformed_patches(self):
+        for patch in ({'op': 'add'}, [{'path': '/a'}], [{'op': 'add', 'path': '/a'}],
+                      [{'op': 'frobnicate', 'path': '/a'}]):
+            with self.assertRaises(PatchError):
+                apply_patch({}, patch)
+
+    def test_copy_on_write_shares_untouched_subtrees(self):
+        doc = [{'id': 'a', 'v': 1}, {'id': 'b', 'v': 2}, {'id': 'c', 'v': 3}]
+        patched = apply_patch(doc, [
+            {'op': 'replace', 'path': '/1/v', 'value': 20},
+            {'op': 'add', 'path': '/-', 'value': {'id': 'd'}},
+        ])
+        self.assertIs(patched[0], doc[0])
+        self.assertIs(patched[2], doc[2])
+        self.assertIsNot(patched[1], doc[1])
+        self.assertEqual(doc[1]['v'], 2)
+        self.assertEqual(changed_items(doc, patched), [{'id': 'b', 'v': 20}, {'id': 'd'}])
+        self.assertIsNone(changed_items(doc, {'id': 'a'}))
+
+
+class PatchEndpointTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.home = tempfile.mkdtemp()
+        os.environ['HOME'] = cls.home
+        import app as app_module
+        cls.app_module = app_module
+        cls.client = app_module.app.test_client()
+
+        # Point the data endpoints at a scratch directory so the real src/data,
+        # its watcher and the built bundle are never touched
+        cls.saved = {name: getattr(app_module, name) for name in ('DATA_DIR', 'file_index', 'game_bundle')}
+        cls.data_dir = os.path.join(cls.home, 'data')
+        os.makedirs(cls.data_dir)
+        file_index = FileIndex(cls.data_dir)
+        app_module.DATA_DIR = cls.data_dir
+        app_module.file_index = file_index
+        app_module.game_bundle = DataBundle(cls.data_dir, path=os.path.join(cls.home, 'build', 'bundle.json'),
+                                            source_version=lambda: file_index.listing()[1])
+        cls.path = os.path.join(cls.data_dir, 'test_json_patch_tmp.json')
+
+    @classmethod
+    def tearDownClass(cls):
+        for name, value in cls.saved.items():
+            setattr(cls.app_module, name, value)
+        shutil.rmtree(cls.home, ignore_errors=True)
+
+    def setUp(self):
+        raw = json.dumps({'count': 1}, indent=2).encode('utf-8')
+        with open(self.path, 'wb') as f:
+            f.write(raw)
+        self.base_hash = hashlib.sha256(raw).hexdigest()
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def patch(self, operations, base_hash):
+        return self.client.patch('/admin/files/test_json_patch_tmp.json',
+                                 json={'patch': operations, 'base_hash': base_hash})
+
+    def test_stale_base_hash_is_rejected(self):
+        first = self.patch([{'op': 'replace', 'path': '/count', 'value': 2}], self.base_hash)
+        self.assertEqual(first.status_code, 200)
+        stale = self.patch([{'op': 'replace', 'path': '/count', 'value': 3}], self.base_hash)
+        self.assertEqual(stale.status_code, 409)
+        self.assertEqual(stale.get_json()['current_hash'], first.get_json()['hash'])
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), {'count': 2})
+
+    def test_failed_test_operation_is_a_conflict(self):
+        response = self.patch([{'op': 'test', 'path': '/count', 'value': True}], self.base_hash)
+        self.assertEqual(response.status_code, 409)
+
+    def test_weak_etag_from_gzip_response_is_accepted_in_if_match(self):
+        contracts = [{'id': f'contract_{i}', 'baseBudget': 100 + i} for i in range(40)]
+        with open(os.path.join(self.data_dir, 'contracts.json'), 'w') as f:
+            json.dump(contracts, f, indent=2)
+        response = self.client.get('/admin/data/contracts', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers.get('Content-Encoding'), 'gzip')
+        etag = response.headers['ETag']
+        self.assertTrue(etag.startswith('W/'))
+
+        patched = self.client.patch('/admin/data/contracts', headers={'If-Match': etag},
+                                    json=[{'op': 'replace', 'path': '/0/baseBudget', 'value': 1}])
+        self.assertEqual(patched.status_code, 200)
+        stale = self.client.patch('/admin/data/contracts', headers={'If-Match': etag},
+                                  json=[{'op': 'replace', 'path': '/0/baseBudget', 'value': 2}])
+        self.assertEqual(stale.status_code, 409)
+
+    def test_invalid_patch_is_a_bad_request(self):
+        response = self.patch([{'op': 'remove', 'path': '/missing'}], self.base_hash)
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()